@@ -59,6 +59,7 @@ class Settings(BaseSettings):
     mysql_password: Annotated[str, Field(default="password"), "database"]
     mysql_root_password: Annotated[str, Field(default="password"), "database"]
     redis_url: Annotated[str, Field(default="redis://127.0.0.1:6379"), "database"]
+    redis_max_connections: Annotated[int, Field(default=64), "database"]
 
     @property
     def database_url(self) -> str:
@@ -181,6 +182,9 @@ class Settings(BaseSettings):
     enable_ranking_cache: Annotated[bool, Field(default=True), "cache"]
     ranking_cache_expire_minutes: Annotated[int, Field(default=10), "cache"]
     ranking_cache_refresh_interval_minutes: Annotated[int, Field(default=10), "cache"]
+    ranking_cache_dirty_refresh_interval_seconds: Annotated[int, Field(default=60), "cache"]
+    ranking_cache_dirty_refresh_max_pages: Annotated[int, Field(default=1), "cache"]
+    ranking_cache_dirty_country_refresh_interval_seconds: Annotated[int, Field(default=300), "cache"]
     ranking_cache_max_pages: Annotated[int, Field(default=20), "cache"]
     top_score_cache_max_pages: Annotated[int, Field(default=3), "cache"]
     ranking_cache_top_countries: Annotated[int, Field(default=20), "cache"]
@@ -192,6 +196,14 @@ class Settings(BaseSettings):
     user_beatmapsets_cache_expire_seconds: Annotated[int, Field(default=600), "cache"]
     user_cache_max_preload_users: Annotated[int, Field(default=200), "cache"]
 
+    # cache - room
+    room_list_cache_expire_seconds: Annotated[int, Field(default=5), "cache"]
+
+    # cache - leaderboard
+    beatmap_leaderboard_cache_expire_seconds: Annotated[int, Field(default=30), "cache"]
+    beatmap_leaderboard_cache_warm_count: Annotated[int, Field(default=50), "cache"]
+    beatmap_leaderboard_cache_warm_interval_seconds: Annotated[int, Field(default=20), "cache"]
+
     # asset_proxy
     enable_asset_proxy: Annotated[bool, Field(default=False), "asset_proxy"]
     custom_asset_domain: Annotated[str, Field(default="g0v0.top"), "asset_proxy"]
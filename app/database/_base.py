@@ -319,6 +319,30 @@ def ondemand(func: DecoratorTarget) -> DecoratorTarget:
     return wrapper
 
 
+@lru_cache(maxsize=1024)
+def _parse_includes(includes: tuple[str, ...]) -> tuple[tuple[str, ...], dict[str, tuple[str, ...]]]:
+    """Split an includes list into direct fields and nested includes per parent field.
+
+    Endpoints pass the same few include lists on every request, so the result is
+    cached and must not be mutated.
+
+    Args:
+        includes: Include paths, e.g. ``("host.country", "playlist")``.
+
+    Returns:
+        The direct includes, and the nested includes grouped by their parent field.
+    """
+    direct: list[str] = []
+    nested: dict[str, list[str]] = {}
+    for include in includes:
+        if "." in include:
+            parent, sub_include = include.split(".", 1)
+            nested.setdefault(parent, []).append(sub_include)
+        else:
+            direct.append(include)
+    return tuple(direct), {parent: tuple(sub_includes) for parent, sub_includes in nested.items()}
+
+
 async def call_awaitable_with_context(
     func: CalculatedField,
     session: AsyncSession,
@@ -450,7 +474,7 @@ class DatabaseModel[TDict](SQLModel, UTCBaseModel, metaclass=DatabaseModelMetacl
         includes: list[str] | None = None,
         **context: Any,
     ) -> TDict:
-        includes = includes.copy() if includes is not None else []
+        direct_includes, sub_include_map = _parse_includes(tuple(includes) if includes else ())
         session = cast(AsyncSession | None, async_object_session(db_instance)) if session is None else session
         if session is None:
             raise RuntimeError("DatabaseModel.transform requires a session-bound instance.")
@@ -462,23 +486,15 @@ class DatabaseModel[TDict](SQLModel, UTCBaseModel, metaclass=DatabaseModelMetacl
             value = await call_awaitable_with_context(func, session, db_instance, context)
             data[field] = value
 
-        sub_include_map: dict[str, list[str]] = {}
-        for include in [i for i in includes if "." in i]:
-            parent, sub_include = include.split(".", 1)
-            if parent not in sub_include_map:
-                sub_include_map[parent] = []
-            sub_include_map[parent].append(sub_include)
-            includes.remove(include)  # pyright: ignore[reportOptionalMemberAccess]
-
         for field, sub_includes in sub_include_map.items():
             if field in cls._ONDEMAND_CALCULATED_FIELDS:
                 func = getattr(cls, field)
                 value = await call_awaitable_with_context(
-                    func, session, db_instance, {**context, "includes": sub_includes}
+                    func, session, db_instance, {**context, "includes": list(sub_includes)}
                 )
                 data[field] = value
 
-        for include in includes:
+        for include in direct_includes:
             if include in data:
                 continue
 
@@ -488,7 +504,7 @@ class DatabaseModel[TDict](SQLModel, UTCBaseModel, metaclass=DatabaseModelMetacl
                 data[include] = value
 
         for field in cls._ONDEMAND_DATABASE_FIELDS:
-            if field not in includes:
+            if field not in direct_includes:
                 del data[field]
 
         for field in cls._EXCLUDED_DATABASE_FIELDS:
@@ -5,6 +5,7 @@ including transformation, fetching, caching, and difficulty attribute
 calculations.
 """
 
+import asyncio
 from datetime import datetime
 import hashlib
 from typing import TYPE_CHECKING, ClassVar, NotRequired, TypedDict
@@ -24,6 +25,7 @@ from .failtime import FailTime, FailTimeResp
 from .user import User, UserDict, UserModel
 
 from pydantic import BaseModel, TypeAdapter
+from pydantic_core import to_json
 from redis.asyncio import Redis
 from sqlalchemy import Column, DateTime
 from sqlalchemy.ext.asyncio import AsyncAttrs
@@ -393,6 +395,26 @@ class APIBeatmapTag(BaseModel):
     count: int
 
 
+ATTRIBUTES_LOCK_EXPIRE_SECONDS = 30
+ATTRIBUTES_LOCK_WAIT_ATTEMPTS = 5  # 0.05s doubling, about 1.5s in total
+
+
+def beatmap_attributes_cache_key(beatmap_id: int, ruleset: GameMode, mods_: list[APIMod]) -> str:
+    """Build the Redis key for cached difficulty attributes.
+
+    Args:
+        beatmap_id: The beatmap ID.
+        ruleset: The ruleset the attributes are calculated for.
+        mods_: The applied mods.
+
+    Returns:
+        Cache key string. Mod order and settings order do not affect the key.
+    """
+    canonical_mods = sorted((mod["acronym"], sorted(mod.get("settings", {}).items())) for mod in mods_)
+    mods_hash = hashlib.blake2b(to_json(canonical_mods), digest_size=16).hexdigest()
+    return f"beatmap:{beatmap_id}:{ruleset}:{mods_hash}:attributes"
+
+
 async def calculate_beatmap_attributes(
     beatmap_id: int,
     ruleset: GameMode,
@@ -400,14 +422,30 @@ async def calculate_beatmap_attributes(
     redis: Redis,
     fetcher: "Fetcher",
 ) -> DifficultyAttributesUnion:
-    key = f"beatmap:{beatmap_id}:{ruleset}:{hashlib.sha256(str(mods_).encode()).hexdigest()}:attributes"
+    key = beatmap_attributes_cache_key(beatmap_id, ruleset, mods_)
     if result := await redis.get(key):
         return TypeAdapter(DifficultyAttributesUnion).validate_json(result)
-    resp = await fetcher.get_or_fetch_beatmap_raw(redis, beatmap_id)
 
-    attr = await get_calculator().calculate_difficulty(resp, mods_, ruleset)
-    await redis.set(key, attr.model_dump_json())
-    return attr
+    # Single-flight: only one caller calculates a given combination, the others wait for its result.
+    lock_key = f"{key}:lock"
+    locked = await redis.set(lock_key, "1", nx=True, ex=ATTRIBUTES_LOCK_EXPIRE_SECONDS)
+    if not locked:
+        delay = 0.05
+        for _ in range(ATTRIBUTES_LOCK_WAIT_ATTEMPTS):
+            await asyncio.sleep(delay)
+            if result := await redis.get(key):
+                return TypeAdapter(DifficultyAttributesUnion).validate_json(result)
+            delay *= 2
+        # The holder is taking too long (or died); calculate it ourselves.
+
+    try:
+        resp = await fetcher.get_or_fetch_beatmap_raw(redis, beatmap_id)
+        attr = await get_calculator().calculate_difficulty(resp, mods_, ruleset)
+        await redis.set(key, attr.model_dump_json())
+        return attr
+    finally:
+        if locked:
+            await redis.delete(lock_key)
 
 
 async def clear_cached_beatmap_raws(redis: Redis, beatmaps: list[int] = []):
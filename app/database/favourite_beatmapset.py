@@ -16,6 +16,7 @@ from sqlmodel import (
     DateTime,
     Field,
     ForeignKey,
+    Index,
     Relationship,
     SQLModel,
 )
@@ -25,6 +26,7 @@ class FavouriteBeatmapset(AsyncAttrs, SQLModel, table=True):
     """Records user favourites for beatmapsets."""
 
     __tablename__: str = "favourite_beatmapset"
+    __table_args__ = (Index("ix_favourite_beatmapset_user_beatmapset", "user_id", "beatmapset_id", unique=True),)
 
     id: int = Field(
         default=None,
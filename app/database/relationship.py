@@ -16,6 +16,7 @@ from sqlmodel import (
     Column,
     Field,
     ForeignKey,
+    Index,
     Relationship as SQLRelationship,
     select,
 )
@@ -73,7 +74,14 @@ class RelationshipModel(DatabaseModel[RelationshipDict]):
 
     @included
     @staticmethod
-    async def mutual(session: AsyncSession, relationship: "Relationship") -> bool:
+    async def mutual(
+        session: AsyncSession,
+        relationship: "Relationship",
+        mutual_target_ids: set[int] | None = None,
+    ) -> bool:
+        # Callers transforming many relationships can pass the users following back, looked up in one query
+        if mutual_target_ids is not None:
+            return relationship.type == RelationshipType.FOLLOW and relationship.target_id in mutual_target_ids
         target_relationship = (
             await session.exec(
                 select(Relationship).where(
@@ -104,6 +112,8 @@ class RelationshipModel(DatabaseModel[RelationshipDict]):
 class Relationship(RelationshipModel, table=True):
     """Database table for user relationships (friends/blocks)."""
 
+    __table_args__ = (Index("ix_relationship_user_target", "user_id", "target_id", unique=True),)
+
     target: Mapped["User"] = SQLRelationship(
         sa_relationship_kwargs={
             "foreign_keys": "[Relationship.target_id]",
@@ -26,7 +26,7 @@ from .user import User, UserDict, UserModel
 from pydantic import field_validator
 from sqlalchemy.ext.asyncio import AsyncAttrs
 from sqlalchemy.orm import Mapped
-from sqlmodel import BigInteger, Column, DateTime, Field, ForeignKey, Relationship, SQLModel, col, select
+from sqlmodel import BigInteger, Column, DateTime, Field, ForeignKey, Index, Relationship, SQLModel, col, func, select
 from sqlmodel.ext.asyncio.session import AsyncSession
 
 
@@ -167,31 +167,19 @@ class RoomModel(DatabaseModel[RoomDict]):
 
     @ondemand
     @staticmethod
-    async def recent_participants(session: AsyncSession, room: "Room") -> list[UserDict]:
-        participants: list[UserDict] = []
-        if room.category == RoomCategory.REALTIME:
-            query = (
-                select(RoomParticipatedUser)
-                .where(
-                    RoomParticipatedUser.room_id == room.id,
-                    col(RoomParticipatedUser.left_at).is_(None),
-                )
-                .limit(8)
-                .order_by(col(RoomParticipatedUser.joined_at).desc())
-            )
+    async def recent_participants(
+        session: AsyncSession,
+        room: "Room",
+        recent_participants_by_room: dict[int, list[User]] | None = None,
+    ) -> list[UserDict]:
+        # List endpoints prefetch the participants of every room with get_recent_participants
+        if recent_participants_by_room is not None:
+            users = recent_participants_by_room.get(room.id, [])
         else:
-            query = (
-                select(RoomParticipatedUser)
-                .where(
-                    RoomParticipatedUser.room_id == room.id,
-                )
-                .limit(8)
-                .order_by(col(RoomParticipatedUser.joined_at).desc())
-            )
-        for recent_participant in await session.exec(query):
-            user_instance = await recent_participant.awaitable_attrs.user
-            participants.append(await UserModel.transform(user_instance))
-        return participants
+            users = (
+                await get_recent_participants(session, [room.id], active_only=room.category == RoomCategory.REALTIME)
+            ).get(room.id, [])
+        return [await UserModel.transform(user) for user in users]
 
     @ondemand
     @staticmethod
@@ -215,6 +203,7 @@ class Room(AsyncAttrs, RoomModel, table=True):
     """Database table for multiplayer rooms."""
 
     __tablename__: str = "rooms"
+    __table_args__ = (Index("ix_rooms_category_status_ends_at", "category", "status", "ends_at"),)
 
     host_id: int = Field(sa_column=Column(BigInteger, ForeignKey("lazer_users.id"), index=True))
     password: str | None = Field(default=None)
@@ -256,3 +245,48 @@ class APIUploadedRoom(SQLModel):
     auto_skip: bool
     auto_start_duration: int
     playlist: list[Playlist] = Field(default_factory=list)
+
+
+async def get_recent_participants(
+    session: AsyncSession, room_ids: list[int], *, active_only: bool, limit: int = 8
+) -> dict[int, list[User]]:
+    """Get the most recently joined participants of several rooms in one query.
+
+    Args:
+        session: Database session.
+        room_ids: Rooms to load participants for.
+        active_only: Only include participants who haven't left (realtime rooms).
+        limit: Maximum number of participants per room.
+
+    Returns:
+        Participants per room ID, most recently joined first.
+    """
+    if not room_ids:
+        return {}
+    wheres = [col(RoomParticipatedUser.room_id).in_(room_ids)]
+    if active_only:
+        wheres.append(col(RoomParticipatedUser.left_at).is_(None))
+    ranked = (
+        select(
+            RoomParticipatedUser.room_id,
+            RoomParticipatedUser.user_id,
+            func.row_number()
+            .over(
+                partition_by=col(RoomParticipatedUser.room_id),
+                order_by=col(RoomParticipatedUser.joined_at).desc(),
+            )
+            .label("position"),
+        )
+        .where(*wheres)
+        .subquery()
+    )
+    rows = await session.exec(
+        select(ranked.c.room_id, User)
+        .join(User, col(User.id) == ranked.c.user_id)
+        .where(ranked.c.position <= limit)
+        .order_by(ranked.c.room_id, ranked.c.position)
+    )
+    participants: dict[int, list[User]] = {}
+    for room_id, user in rows:
+        participants.setdefault(room_id, []).append(user)
+    return participants
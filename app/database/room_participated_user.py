@@ -16,6 +16,7 @@ from sqlmodel import (
     DateTime,
     Field,
     ForeignKey,
+    Index,
     Relationship,
     SQLModel,
 )
@@ -29,6 +30,7 @@ class RoomParticipatedUser(AsyncAttrs, SQLModel, table=True):
     """Tracks user participation history in multiplayer rooms."""
 
     __tablename__: str = "room_participated_users"
+    __table_args__ = (Index("ix_room_participated_users_user_room", "user_id", "room_id"),)
 
     id: int | None = Field(default=None, sa_column=Column(BigInteger, primary_key=True, autoincrement=True))
     room_id: int = Field(sa_column=Column(ForeignKey("rooms.id"), nullable=False))
@@ -67,9 +67,9 @@ from .user import User, UserDict, UserModel
 
 from pydantic import BaseModel, field_serializer, field_validator
 from redis.asyncio import Redis
-from sqlalchemy import Boolean, Column, DateTime, Index, TextClause, exists
+from sqlalchemy import Boolean, Column, DateTime, Index, TextClause, case, exists
 from sqlalchemy.ext.asyncio import AsyncAttrs
-from sqlalchemy.orm import Mapped, aliased, joinedload
+from sqlalchemy.orm import Mapped, aliased, joinedload, selectinload
 from sqlalchemy.sql.elements import ColumnElement
 from sqlmodel import (
     JSON,
@@ -192,7 +192,11 @@ class ScoreModel(AsyncAttrs, DatabaseModel[ScoreDict]):
     async def best_id(
         session: AsyncSession,
         score: "Score",
+        best_ids: dict[int, int] | None = None,
     ) -> int | None:
+        # List endpoints prefetch the best IDs of all their scores with get_best_ids
+        if best_ids is not None:
+            return best_ids.get(score.id)
         return await get_best_id(session, score.id)
 
     @included
@@ -432,6 +436,7 @@ class Score(ScoreModel, table=True):
         Index("idx_score_user_mode_pinned", "user_id", "gamemode", "pinned_order", "id"),
         Index("idx_score_user_mode_pp", "user_id", "gamemode", "pp", "id"),
         Index("idx_score_user_mode_date", "user_id", "gamemode", "ended_at", "id"),
+        Index("idx_score_room_playlist_item", "room_id", "playlist_item_id"),
     )
 
     # ScoreStatistics
@@ -519,11 +524,15 @@ class Score(ScoreModel, table=True):
         )
 
     async def to_resp(
-        self, session: AsyncSession, api_version: int, includes: list[str] = []
+        self,
+        session: AsyncSession,
+        api_version: int,
+        includes: list[str] = [],
+        best_ids: dict[int, int] | None = None,
     ) -> "ScoreDict | LegacyScoreResp":
         if api_version >= NEW_SCORE_FORMAT_VER:
-            return await ScoreModel.transform(self, includes=includes)
-        return await LegacyScoreResp.from_db(session, self)
+            return await ScoreModel.transform(self, includes=includes, best_ids=best_ids)
+        return await LegacyScoreResp.from_db(session, self, best_ids=best_ids)
 
     async def delete(
         self,
@@ -588,11 +597,14 @@ class LegacyScoreResp(UTCBaseModel):
     replay: bool
 
     @classmethod
-    async def from_db(cls, session: AsyncSession, score: "Score") -> "LegacyScoreResp":
+    async def from_db(
+        cls, session: AsyncSession, score: "Score", best_ids: dict[int, int] | None = None
+    ) -> "LegacyScoreResp":
         await score.awaitable_attrs.beatmap
+        best_id = best_ids.get(score.id) if best_ids is not None else await get_best_id(session, score.id)
         return cls(
             accuracy=score.accuracy,
-            best_id=await get_best_id(session, score.id) or 0,
+            best_id=best_id or 0,
             created_at=score.started_at,
             id=score.id,
             max_combo=score.max_combo,
@@ -648,6 +660,68 @@ async def get_best_id(session: AsyncSession, score_id: int) -> int | None:
     return result.one_or_none()
 
 
+async def get_best_ids(session: AsyncSession, scores: Sequence["Score"]) -> dict[int, int]:
+    """Get the best score IDs of several scores in one query.
+
+    Batched counterpart of `get_best_id`. The ranking window is partitioned by
+    user and mode, so it only needs to cover the users of the given scores.
+
+    Args:
+        session: The database session to use for the query.
+        scores: The scores for which to find the best score IDs.
+
+    Returns:
+        A mapping from score ID to best score ID; scores without one are omitted.
+    """
+    if not scores:
+        return {}
+    rownum = (
+        func.row_number()
+        .over(partition_by=(col(BestScore.user_id), col(BestScore.gamemode)), order_by=col(BestScore.pp).desc())
+        .label("rn")
+    )
+    subq = (
+        select(BestScore.score_id, rownum)
+        .where(col(BestScore.user_id).in_({score.user_id for score in scores}))
+        .subquery()
+    )
+    stmt = select(subq.c.score_id, subq.c.rn).where(subq.c.score_id.in_([score.id for score in scores]))
+    return dict((await session.exec(stmt)).all())
+
+
+async def scores_to_resp(
+    session: AsyncSession,
+    scores: Sequence["Score"],
+    api_version: int,
+    includes: list[str] = [],
+) -> list["ScoreDict | LegacyScoreResp"]:
+    """Convert a list of scores to responses without per-score lookups.
+
+    The best IDs and, when requested, the users' team memberships are loaded
+    for all scores up front instead of once per score.
+
+    Args:
+        session: The database session to use for the queries.
+        scores: The scores to convert.
+        api_version: The client API version, selecting the new or legacy format.
+        includes: The includes passed to `Score.to_resp`.
+
+    Returns:
+        The score responses, in the order of ``scores``.
+    """
+    if not scores:
+        return []
+    if api_version >= NEW_SCORE_FORMAT_VER and "user.team" in includes:
+        # Populates team_membership on the already-loaded users through the identity map
+        await session.exec(
+            select(User)
+            .where(col(User.id).in_({score.user_id for score in scores}))
+            .options(selectinload(User.team_membership))
+        )
+    best_ids = await get_best_ids(session, scores)
+    return [await score.to_resp(session, api_version, includes=includes, best_ids=best_ids) for score in scores]
+
+
 async def _score_where(
     type: LeaderboardType,
     beatmap: int,
@@ -867,6 +941,67 @@ async def get_score_position_by_id(
     return s or 0
 
 
+def score_global_position_column() -> ColumnElement[int]:
+    """Build a column with the global leaderboard position of the selected score.
+
+    The expression correlates with `Score` in the enclosing query. Instead of numbering the
+    whole leaderboard like `get_score_position_by_id`, it counts the best scores ranked above
+    the score, which only walks the part of the `(beatmap_id, gamemode, total_score)` index
+    above it. Tied scores share a position.
+
+    Returns:
+        A labelled column evaluating to the 1-based position, or 0 if the score is not on the leaderboard.
+    """
+    own = aliased(TotalScoreBestScore)
+    higher = aliased(TotalScoreBestScore)
+    higher_count = (
+        select(func.count())
+        .select_from(higher)
+        .where(
+            col(higher.beatmap_id) == Score.beatmap_id,
+            col(higher.gamemode) == Score.gamemode,
+            col(higher.total_score) > Score.total_score,
+            ~User.is_restricted_query(col(higher.user_id)),
+        )
+        .scalar_subquery()
+    )
+    on_leaderboard = exists().where(col(own.score_id) == Score.id) & ~User.is_restricted_query(col(Score.user_id))
+    return case((on_leaderboard, higher_count + 1), else_=0).label("position")
+
+
+async def get_user_best_score_with_position(
+    session: AsyncSession,
+    beatmap: int,
+    user: int,
+    mode: GameMode,
+) -> tuple[Score, int] | None:
+    """Get the user's best score for a specific beatmap and mode with its global position.
+
+    Args:
+        session: The database session to use for the query.
+        beatmap: The ID of the beatmap for which to retrieve the best score.
+        user: The ID of the user for whom to retrieve the best score.
+        mode: The game mode for which to retrieve the best score.
+
+    Returns:
+        The user's best score and its global position, or None if not found.
+    """
+    row = (
+        await session.exec(
+            select(Score, score_global_position_column())
+            .join(TotalScoreBestScore, col(TotalScoreBestScore.score_id) == Score.id)
+            .where(
+                TotalScoreBestScore.beatmap_id == beatmap,
+                TotalScoreBestScore.gamemode == mode,
+                TotalScoreBestScore.user_id == user,
+            )
+            .order_by(col(TotalScoreBestScore.total_score).desc())
+            .limit(1)
+        )
+    ).first()
+    return (row[0], row[1]) if row else None
+
+
 async def get_user_best_score_in_beatmap(
     session: AsyncSession,
     beatmap: int,
@@ -1179,7 +1314,7 @@ async def process_score(
         started_at=score_token.created_at,
         user_id=user.id,
         preserve=info.passed,
-        map_md5=score_token.beatmap.checksum,
+        map_md5=beatmap.checksum,
         has_replay=False,
         type="solo",
         n300=info.statistics.get(HitResult.GREAT, 0),
@@ -47,6 +47,7 @@ class ScoreToken(ScoreTokenBase, table=True):
     __table_args__ = (
         Index("idx_user_playlist", "user_id", "playlist_item_id"),
         Index("idx_playlist_room", "playlist_item_id", "room_id"),
+        Index("idx_score_token_score_id", "score_id"),
     )
 
     user: Mapped[User] = Relationship()
@@ -22,6 +22,7 @@ from sqlmodel import (
     Column,
     Field,
     ForeignKey,
+    Index,
     Relationship,
     col,
     func,
@@ -158,6 +159,10 @@ class UserStatistics(AsyncAttrs, UserStatisticsModel, table=True):
     """Database table for user statistics per game mode."""
 
     __tablename__: str = "lazer_user_statistics"
+    __table_args__ = (
+        Index("ix_lazer_user_statistics_mode_ranked_pp", "mode", "is_ranked", "pp"),
+        Index("ix_lazer_user_statistics_mode_ranked_score", "mode", "is_ranked", "ranked_score"),
+    )
     id: int | None = Field(default=None, primary_key=True)
     user_id: int = Field(
         default=None,
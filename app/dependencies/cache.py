@@ -5,6 +5,14 @@ from app.service.beatmapset_cache_service import (
     BeatmapsetCacheService as OriginBeatmapsetCacheService,
     get_beatmapset_cache_service,
 )
+from app.service.leaderboard_cache_service import (
+    LeaderboardCacheService as OriginLeaderboardCacheService,
+    get_leaderboard_cache_service,
+)
+from app.service.ranking_cache_service import (
+    RankingCacheService as OriginRankingCacheService,
+    get_ranking_cache_service,
+)
 from app.service.user_cache_service import (
     UserCacheService as OriginUserCacheService,
     get_user_cache_service,
@@ -18,6 +26,14 @@ def get_beatmapset_cache_dependency(redis: Redis) -> OriginBeatmapsetCacheServic
     return get_beatmapset_cache_service(redis)
 
 
+def get_leaderboard_cache_dependency(redis: Redis) -> OriginLeaderboardCacheService:
+    return get_leaderboard_cache_service(redis)
+
+
+def get_ranking_cache_dependency(redis: Redis) -> OriginRankingCacheService:
+    return get_ranking_cache_service(redis)
+
+
 def get_user_cache_dependency(redis: Redis) -> OriginUserCacheService:
     return get_user_cache_service(redis)
 
@@ -28,3 +44,11 @@ BeatmapsetCacheService = Annotated[
 UserCacheService = Annotated[
     OriginUserCacheService, Depends(get_user_cache_dependency), FastDepends(get_user_cache_dependency)
 ]
+RankingCacheService = Annotated[
+    OriginRankingCacheService, Depends(get_ranking_cache_dependency), FastDepends(get_ranking_cache_dependency)
+]
+LeaderboardCacheService = Annotated[
+    OriginLeaderboardCacheService,
+    Depends(get_leaderboard_cache_dependency),
+    FastDepends(get_leaderboard_cache_dependency),
+]
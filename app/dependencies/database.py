@@ -12,6 +12,7 @@ from fastapi import Depends
 from pydantic import BaseModel
 import redis.asyncio as redis
 from sqlalchemy.ext.asyncio import create_async_engine
+from sqlalchemy.orm.attributes import instance_state
 from sqlmodel import SQLModel
 from sqlmodel.ext.asyncio.session import AsyncSession
 
@@ -34,8 +35,15 @@ engine = create_async_engine(
     pool_pre_ping=True,
 )
 
-# Redis connection
-redis_client = redis.from_url(settings.redis_url, decode_responses=True, db=0)
+# Redis connection. All request handlers share this client, so back it with a bounded
+# pool that makes callers wait for a free connection instead of opening new ones under load.
+redis_pool = redis.BlockingConnectionPool.from_url(
+    settings.redis_url,
+    decode_responses=True,
+    db=0,
+    max_connections=settings.redis_max_connections,
+)
+redis_client = redis.Redis.from_pool(redis_pool)
 
 # Dedicated client for blocking reads. redis-py 8 applies a default socket timeout
 # to connections, which breaks blocking commands like pubsub reads and BRPOP.
@@ -96,6 +104,12 @@ async def with_db():
             await session.close()
 
 
+async def refresh_if_expired(session: AsyncSession, instance: SQLModel) -> None:
+    """Reload ``instance`` only if a commit earlier in the request expired it."""
+    if instance_state(instance).expired:
+        await session.refresh(instance)
+
+
 DBFactory = Callable[[], AsyncIterator[AsyncSession]]
 Database = Annotated[AsyncSession, Depends(get_db), FastDepends(get_db)]
 NoContextDB = Annotated[AsyncSession, Depends(get_no_context_db), FastDepends(get_no_context_db)]
@@ -10,8 +10,10 @@ Classes:
 """
 
 import asyncio
+from collections.abc import Awaitable, Callable
 from datetime import datetime
 import time
+from typing import Any
 
 from app.dependencies.database import get_redis
 from app.log import fetcher_logger
@@ -130,6 +132,7 @@ class BaseFetcher:
         self.callback_url: str = callback_url
         self.scope = scope
         self._token_lock = asyncio.Lock()
+        self._inflight: dict[str, asyncio.Task[Any]] = {}
 
     # NOTE: Reserve for user-based fetchers
     # @property
@@ -152,6 +155,27 @@ class BaseFetcher:
             "Content-Type": "application/json",
         }
 
+    async def coalesce[T](self, key: str, fetch: Callable[[], Awaitable[T]]) -> T:
+        """Share a single in-flight fetch between concurrent callers.
+
+        The first caller for ``key`` starts ``fetch``; callers arriving while it
+        is still running await the same task instead of sending a duplicate
+        upstream request. A cancelled caller does not cancel the shared task.
+
+        Args:
+            key: Identifies the upstream resource being fetched.
+            fetch: Zero-argument coroutine function performing the fetch.
+
+        Returns:
+            The result of ``fetch``.
+        """
+        task = self._inflight.get(key)
+        if task is None:
+            task = asyncio.ensure_future(fetch())
+            self._inflight[key] = task
+            task.add_done_callback(lambda _: self._inflight.pop(key, None))
+        return await asyncio.shield(task)
+
     async def request_api(self, url: str, method: str = "GET", **kwargs) -> dict:
         """Send an API request with passive rate limiting support.
 
@@ -55,6 +55,7 @@ class BeatmapFetcher(BaseFetcher):
 
         Retrieves beatmap information from the osu! API v2 beatmaps/lookup endpoint.
         At least one of beatmap_id or beatmap_checksum must be provided.
+        Concurrent lookups of the same beatmap share one upstream request.
 
         Args:
             beatmap_id: The beatmap ID to look up. Defaults to None.
@@ -68,21 +69,24 @@ class BeatmapFetcher(BaseFetcher):
         Raises:
             ValueError: If neither beatmap_id nor beatmap_checksum is provided.
         """
-        hub.emit(FetchingBeatmapEvent(beatmap_id=beatmap_id, beatmap_checksum=beatmap_checksum))
-
         if beatmap_id:
             params = {"id": beatmap_id}
         elif beatmap_checksum:
             params = {"checksum": beatmap_checksum}
         else:
             raise ValueError("Either beatmap_id or beatmap_checksum must be provided.")
-        logger.opt(colors=True).debug(f"get_beatmap: <y>{params}</y>")
 
-        beatmap = adapter.validate_python(
-            await self.request_api(
-                "https://osu.ppy.sh/api/v2/beatmaps/lookup",
-                params=params,
+        async def fetch() -> BeatmapDict:
+            hub.emit(FetchingBeatmapEvent(beatmap_id=beatmap_id, beatmap_checksum=beatmap_checksum))
+            logger.opt(colors=True).debug(f"get_beatmap: <y>{params}</y>")
+            beatmap = adapter.validate_python(
+                await self.request_api(
+                    "https://osu.ppy.sh/api/v2/beatmaps/lookup",
+                    params=params,
+                )
             )
-        )
-        hub.emit(BeatmapFetchedEvent(beatmap_id=beatmap["id"], beatmap_data=beatmap))  # pyright: ignore[reportArgumentType]
-        return beatmap  # pyright: ignore[reportReturnType]
+            hub.emit(BeatmapFetchedEvent(beatmap_id=beatmap["id"], beatmap_data=beatmap))  # pyright: ignore[reportArgumentType]
+            return beatmap  # pyright: ignore[reportReturnType]
+
+        key = "beatmap:" + ":".join(f"{k}:{v}" for k, v in params.items())
+        return await self.coalesce(key, fetch)
@@ -228,15 +228,15 @@ class BeatmapRawFetcher(BaseFetcher):
         cache_key = f"beatmap:{beatmap_id}:raw"
         cache_expire = settings.beatmap_cache_expire_hours * 60 * 60
 
-        # Check cache
-        if await redis.exists(cache_key):
-            content = await redis.get(cache_key)
-            if content:
-                # Extend cache TTL
-                await redis.expire(cache_key, cache_expire)
-                if isinstance(content, bytes):
-                    return content.decode("utf-8")
-                return content
+        # Check cache and extend its TTL in one round-trip; EXPIRE on a missing key is a no-op
+        async with redis.pipeline(transaction=False) as pipe:
+            pipe.get(cache_key)
+            pipe.expire(cache_key, cache_expire)
+            content, _ = await pipe.execute()
+        if content:
+            if isinstance(content, bytes):
+                return content.decode("utf-8")
+            return content
 
         # Fetch and cache
         raw = await self.get_beatmap_raw(beatmap_id)
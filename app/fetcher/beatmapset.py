@@ -190,15 +190,19 @@ class BeatmapsetFetcher(BaseFetcher):
         Returns:
             A dictionary containing the beatmapset data with extended
             information including beatmaps, availability, and metadata.
+            Concurrent requests for the same beatmapset share one upstream call.
         """
-        hub.emit(FetchingBeatmapsetEvent(beatmapset_id=beatmap_set_id))
 
-        logger.opt(colors=True).debug(f"get_beatmapset: <y>{beatmap_set_id}</y>")
-        beatmapset = adapter.validate_python(
-            await self.request_api(f"https://osu.ppy.sh/api/v2/beatmapsets/{beatmap_set_id}")
-        )
-        hub.emit(BeatmapsetFetchedEvent(beatmapset_id=beatmap_set_id, beatmapset_data=beatmapset))  # pyright: ignore[reportArgumentType]
-        return beatmapset  # pyright: ignore[reportReturnType]
+        async def fetch() -> BeatmapsetDict:
+            hub.emit(FetchingBeatmapsetEvent(beatmapset_id=beatmap_set_id))
+            logger.opt(colors=True).debug(f"get_beatmapset: <y>{beatmap_set_id}</y>")
+            beatmapset = adapter.validate_python(
+                await self.request_api(f"https://osu.ppy.sh/api/v2/beatmapsets/{beatmap_set_id}")
+            )
+            hub.emit(BeatmapsetFetchedEvent(beatmapset_id=beatmap_set_id, beatmapset_data=beatmapset))  # pyright: ignore[reportArgumentType]
+            return beatmapset  # pyright: ignore[reportReturnType]
+
+        return await self.coalesce(f"beatmapset:{beatmap_set_id}", fetch)
 
     async def search_beatmapset(
         self, query: SearchQueryModel, cursor: Cursor, redis_client: redis.Redis
@@ -10,6 +10,7 @@ from app.config import settings
 from app.const import NEW_SCORE_FORMAT_VER
 from app.database import BestScore, ScoreModel
 from app.database.score import Score
+from app.dependencies.cache import RankingCacheService
 from app.dependencies.database import Database, Redis
 from app.dependencies.storage import StorageService
 from app.dependencies.user import ClientUser
@@ -17,7 +18,6 @@ from app.helpers import api_doc
 from app.log import log
 from app.models.error import ErrorType, RequestError
 from app.models.score import GameMode
-from app.service.ranking_cache_service import get_ranking_cache_service
 from app.service.user_cache_service import refresh_user_cache_background
 
 from .router import router
@@ -75,12 +75,11 @@ if settings.allow_delete_scores:
 )
 async def get_top_scores(
     session: Database,
-    redis: Redis,
+    cache_service: RankingCacheService,
     background_task: BackgroundTasks,
     ruleset: Annotated[GameMode, Path(description="Game mode to filter scores by")],
     page: Annotated[int, Query(description="Page number for pagination", ge=1)] = 1,
 ):
-    cache_service = get_ranking_cache_service(redis)
     cache = await cache_service.get_cached_top_scores(ruleset, page)
     if cache is not None:
         return cache
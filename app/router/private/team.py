@@ -8,7 +8,8 @@ from typing import Annotated
 
 from app.database.team import Team, TeamMember, TeamRequest, TeamResp
 from app.database.user import User, UserModel
-from app.dependencies.database import Database, Redis
+from app.dependencies.cache import RankingCacheService
+from app.dependencies.database import Database
 from app.dependencies.storage import StorageService
 from app.dependencies.user import ClientUser
 from app.helpers import api_doc, check_image, utcnow
@@ -30,7 +31,6 @@ from app.models.notification import (
 from app.models.score import GameMode
 from app.plugins import hub
 from app.router.notification import server
-from app.service.ranking_cache_service import get_ranking_cache_service
 
 from .router import router
 
@@ -55,7 +55,7 @@ async def create_team(
     cover: Annotated[bytes, File(..., description="Team cover file")],
     name: Annotated[str, Form(max_length=100, description="Team name")],
     short_name: Annotated[str, Form(max_length=10, description="Team short name")],
-    redis: Redis,
+    cache_service: RankingCacheService,
     playmode: Annotated[GameMode, Form(description="Team game mode")] = GameMode.OSU,
     description: Annotated[str | None, Form(description="Team description")] = None,
     website: Annotated[str | None, Form(description="Team website")] = None,
@@ -112,7 +112,6 @@ async def create_team(
     await session.commit()
     await session.refresh(team)
 
-    cache_service = get_ranking_cache_service(redis)
     await cache_service.invalidate_team_cache()
     hub.emit(
         TeamCreatedEvent(
@@ -241,7 +240,7 @@ async def delete_team(
     session: Database,
     team_id: Annotated[int, Path(..., description="Team ID")],
     current_user: ClientUser,
-    redis: Redis,
+    cache_service: RankingCacheService,
 ):
     if await current_user.is_restricted(session):
         raise RequestError(ErrorType.ACCOUNT_RESTRICTED)
@@ -263,7 +262,6 @@ async def delete_team(
     await session.delete(team)
     await session.commit()
 
-    cache_service = get_ranking_cache_service(redis)
     await cache_service.invalidate_team_cache()
     hub.emit(
         TeamDeletedEvent(team_id=team_id, actor_user_id=current_user_id, name=team_name, short_name=team_short_name)
@@ -366,7 +364,7 @@ async def handle_request(
     team_id: Annotated[int, Path(..., description="Team ID")],
     user_id: Annotated[int, Path(..., description="User ID")],
     current_user: ClientUser,
-    redis: Redis,
+    cache_service: RankingCacheService,
 ):
     if await current_user.is_restricted(session):
         raise RequestError(ErrorType.ACCOUNT_RESTRICTED)
@@ -396,7 +394,6 @@ async def handle_request(
 
         await server.new_private_notification(TeamApplicationAccept.init(team_request))
 
-        cache_service = get_ranking_cache_service(redis)
         await cache_service.invalidate_team_cache()
     else:
         await server.new_private_notification(TeamApplicationReject.init(team_request))
@@ -422,7 +419,7 @@ async def kick_member(
     team_id: Annotated[int, Path(..., description="Team ID")],
     user_id: Annotated[int, Path(..., description="User ID")],
     current_user: ClientUser,
-    redis: Redis,
+    cache_service: RankingCacheService,
 ):
     if await current_user.is_restricted(session):
         raise RequestError(ErrorType.ACCOUNT_RESTRICTED)
@@ -447,7 +444,6 @@ async def kick_member(
     await session.delete(team_member)
     await session.commit()
 
-    cache_service = get_ranking_cache_service(redis)
     await cache_service.invalidate_team_cache()
     hub.emit(TeamMemberRemovedEvent(team_id=team_id, user_id=user_id, actor_user_id=current_user_id))
     logger.info(f"User {user_id} removed from team {team_id} by user {current_user_id}")
@@ -10,7 +10,7 @@ from typing import Annotated, Literal
 
 from app.database.counts import ReplayWatchedCount
 from app.database.score import Score
-from app.dependencies.database import Database
+from app.dependencies.database import Database, with_db
 from app.dependencies.rate_limit import create_rate_limiter
 from app.dependencies.storage import StorageService
 from app.models.error import ErrorType, RequestError
@@ -21,12 +21,43 @@ from app.plugins import hub
 
 from .router import router
 
-from fastapi import Depends, Query
+from fastapi import BackgroundTasks, Depends, Query
 from pydantic import BaseModel
 from pyrate_limiter import Duration, Rate
 from sqlmodel import col, select
 
 
+async def _record_replay_watched(score_id: int, user_id: int):
+    """Increment the monthly replay watch counter and emit the download event.
+
+    Runs after the response has been sent so the client does not wait on the
+    commit or on event subscribers.
+
+    Args:
+        score_id: The downloaded score ID.
+        user_id: The score owner's user ID.
+    """
+    today = date.today()
+    year, month = today.year, today.month
+    async with with_db() as session:
+        replay_watched_count = (
+            await session.exec(
+                select(ReplayWatchedCount).where(
+                    ReplayWatchedCount.user_id == user_id,
+                    ReplayWatchedCount.year == year,
+                    ReplayWatchedCount.month == month,
+                )
+            )
+        ).first()
+        if replay_watched_count is None:
+            replay_watched_count = ReplayWatchedCount(user_id=user_id, year=year, month=month)
+            session.add(replay_watched_count)
+        replay_watched_count.count += 1
+        await session.commit()
+
+    hub.emit(ReplayDownloadedEvent(score_id=score_id, owner_user_id=user_id))
+
+
 class ReplayModel(BaseModel):
     """V1 API replay response model.
 
@@ -51,6 +82,7 @@ async def download_replay(
     beatmap: Annotated[int, Query(..., alias="b", description="Beatmap ID")],
     user: Annotated[str, Query(..., alias="u", description="User")],
     storage_service: StorageService,
+    background_tasks: BackgroundTasks,
     ruleset_id: Annotated[
         int | None,
         Query(
@@ -68,14 +100,15 @@ async def download_replay(
     """Download replay data for a score.
 
     This endpoint retrieves the replay file for a specific score and returns it
-    as base64-encoded data. It also increments the replay watch counter for
-    the score owner.
+    as base64-encoded data. The replay watch counter for the score owner is
+    incremented in the background after the response is sent.
 
     Args:
         session: Database session.
         beatmap: The beatmap ID.
         user: The user (username or ID based on type parameter).
         storage_service: Storage service for file access.
+        background_tasks: Used to record the watch count after responding.
         ruleset_id: Game mode filter (0=osu!, 1=taiko, 2=catch, 3=mania).
         score_id: Specific score ID to retrieve.
         type: Interpret user parameter as 'string' (username) or 'id'.
@@ -113,27 +146,7 @@ async def download_replay(
     if not await storage_service.is_exists(filepath):
         raise RequestError(ErrorType.REPLAY_FILE_NOT_FOUND)
 
-    replay_watched_count = (
-        await session.exec(
-            select(ReplayWatchedCount).where(
-                ReplayWatchedCount.user_id == score_record.user_id,
-                ReplayWatchedCount.year == date.today().year,
-                ReplayWatchedCount.month == date.today().month,
-            )
-        )
-    ).first()
-    if replay_watched_count is None:
-        replay_watched_count = ReplayWatchedCount(
-            user_id=score_record.user_id,
-            year=date.today().year,
-            month=date.today().month,
-        )
-        session.add(replay_watched_count)
-    replay_watched_count.count += 1
-
-    hub.emit(ReplayDownloadedEvent(score_id=score_record.id, owner_user_id=score_record.user_id))
-
-    await session.commit()
+    background_tasks.add_task(_record_replay_watched, score_record.id, score_record.user_id)
 
     data = await storage_service.read_file(filepath)
 
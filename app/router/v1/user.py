@@ -13,12 +13,14 @@ from app.dependencies.database import Database, get_redis
 from app.log import logger
 from app.models.error import ErrorType, RequestError
 from app.models.score import GameMode
-from app.service.user_cache_service import get_user_cache_service
+from app.service.user_cache_service import UserCacheService, get_user_cache_service
 
 from .router import AllStrModel, router
 
-from fastapi import BackgroundTasks, Query
+from fastapi import BackgroundTasks, Query, Response
+from pydantic_core import from_json
 from sqlmodel import col, select
+from sqlmodel.ext.asyncio.session import AsyncSession
 
 
 class V1User(AllStrModel):
@@ -91,10 +93,11 @@ class V1User(AllStrModel):
         return f"v1_user:{user_id}"
 
     @classmethod
-    async def from_db(cls, db_user: User, ruleset: GameMode | None = None) -> "V1User":
+    async def from_db(cls, session: AsyncSession, db_user: User, ruleset: GameMode | None = None) -> "V1User":
         """Create a V1User instance from a database user record.
 
         Args:
+            session: Database session.
             db_user: The user database record.
             ruleset: Optional game mode for statistics (defaults to user's preferred mode).
 
@@ -102,18 +105,22 @@ class V1User(AllStrModel):
             A V1User instance with all fields populated.
         """
         ruleset = ruleset or db_user.playmode
-        current_statistics: UserStatistics | None = None
-        for i in await db_user.awaitable_attrs.statistics:
-            if i.mode == ruleset:
-                current_statistics = i
-                break
+        current_statistics = (
+            await session.exec(
+                select(UserStatistics).where(
+                    UserStatistics.user_id == db_user.id,
+                    UserStatistics.mode == ruleset,
+                )
+            )
+        ).first()
         if current_statistics:
             statistics = await UserStatisticsModel.transform(
                 current_statistics, country_code=db_user.country_code, includes=["country_rank"]
             )
         else:
             statistics = None
-        return cls(
+        # Every value already has its field type, so skip validation.
+        return cls.model_construct(
             user_id=db_user.id,
             username=db_user.username,
             join_date=db_user.join_date,
@@ -124,9 +131,9 @@ class V1User(AllStrModel):
             ranked_score=current_statistics.ranked_score if current_statistics else 0,
             total_score=current_statistics.total_score if current_statistics else 0,
             pp_rank=statistics.get("global_rank") or 0 if statistics else 0,
-            level=current_statistics.level_current if current_statistics else 0,
+            level=current_statistics.level_current if current_statistics else 0.0,
             pp_raw=current_statistics.pp if current_statistics else 0.0,
-            accuracy=current_statistics.hit_accuracy if current_statistics else 0,
+            accuracy=current_statistics.hit_accuracy if current_statistics else 0.0,
             count_rank_ss=current_statistics.grade_ss if current_statistics else 0,
             count_rank_ssh=current_statistics.grade_ssh if current_statistics else 0,
             count_rank_s=current_statistics.grade_s if current_statistics else 0,
@@ -139,6 +146,13 @@ class V1User(AllStrModel):
         )
 
 
+async def _cache_v1_user(
+    cache_service: UserCacheService, v1_user: V1User, user_id: int, ruleset: GameMode | None
+) -> None:
+    """Serialize and cache a V1 user response body after the response has been sent."""
+    await cache_service.cache_v1_user(f"[{v1_user.model_dump_json()}]", user_id, v1_user.username, ruleset)
+
+
 @router.get(
     "/get_user",
     response_model=list[V1User],
@@ -170,6 +184,7 @@ async def get_user(
 
     Returns:
         List containing a single V1User object, or empty list if not found.
+        Cache hits return the cached response body as-is.
 
     Raises:
         RequestError: If the request parameters are invalid.
@@ -183,7 +198,7 @@ async def get_user(
     # Parse ruleset
     ruleset = GameMode.from_int_extra(ruleset_id) if ruleset_id else None
 
-    # If ID query, try to get from cache first
+    # Try to get from cache first
     cached_v1_user = None
     user_id_for_cache = None
 
@@ -192,9 +207,17 @@ async def get_user(
             user_id_for_cache = int(user)
             cached_v1_user = await cache_service.get_v1_user_from_cache(user_id_for_cache, ruleset)
             if cached_v1_user:
-                return [V1User(**cached_v1_user)]
+                return Response(content=cached_v1_user, media_type="application/json")
         except (ValueError, TypeError):
             pass  # Not a valid user ID, continue with database query
+    else:
+        # Username lookups reuse the ID-keyed cache through a username -> user ID pointer
+        user_id_for_cache = await cache_service.get_v1_user_id_by_username(user)
+        if user_id_for_cache is not None:
+            cached_v1_user = await cache_service.get_v1_user_from_cache(user_id_for_cache, ruleset)
+            # The pointer can outlive a rename, so only trust it while the name still matches
+            if cached_v1_user and from_json(cached_v1_user)[0]["username"].lower() == user.lower():
+                return Response(content=cached_v1_user, media_type="application/json")
 
     # Query user from database
     db_user = (
@@ -211,12 +234,11 @@ async def get_user(
 
     try:
         # Generate user data
-        v1_user = await V1User.from_db(db_user, ruleset)
+        v1_user = await V1User.from_db(session, db_user, ruleset)
 
         # Async cache result (if user ID available)
         if db_user.id is not None:
-            user_data = v1_user.model_dump()
-            background_tasks.add_task(cache_service.cache_v1_user, user_data, db_user.id, ruleset)
+            background_tasks.add_task(_cache_v1_user, cache_service, v1_user, db_user.id, ruleset)
 
         return [v1_user]
 
@@ -225,38 +247,3 @@ async def get_user(
     except ValueError as e:
         logger.error(f"Error processing V1 user data: {e}")
         raise RequestError(ErrorType.INTERNAL)
-
-
-# Helper functions for get_player_info endpoint implementation
-
-
-async def _get_pp_history_for_mode(session: Database, user_id: int, mode: GameMode, days: int = 30) -> list[float]:
-    """Get PP history for a specific game mode.
-
-    Args:
-        session: Database session.
-        user_id: The user ID.
-        mode: The game mode.
-        days: Number of days of history to return.
-
-    Returns:
-        List of PP values for the specified number of days.
-    """
-    try:
-        # Get last 30 days rank history (since we don't have PP history, use current PP)
-        stats = (
-            await session.exec(
-                select(UserStatistics).where(
-                    UserStatistics.user_id == user_id,
-                    UserStatistics.mode == mode,
-                    ~User.is_restricted_query(col(UserStatistics.user_id)),
-                )
-            )
-        ).first()
-
-        current_pp = stats.pp if stats else 0.0
-        # Create 30 days of PP history (filled with current PP value)
-        return [current_pp] * days
-    except Exception as e:
-        logger.error(f"Error getting PP history for user {user_id}, mode {mode}: {e}")
-        return [0.0] * days
@@ -5,8 +5,6 @@ single beatmap lookups, batch retrieval, and difficulty attribute calculations.
 """
 
 import asyncio
-import hashlib
-import json
 from typing import Annotated
 
 from app.calculating import ConvertError, get_calculator
@@ -15,27 +13,37 @@ from app.database import (
     BeatmapModel,
     User,
 )
-from app.database.beatmap import calculate_beatmap_attributes
-from app.dependencies.database import Database, Redis
+from app.database.beatmap import beatmap_attributes_cache_key, calculate_beatmap_attributes
+from app.dependencies.database import Database, Redis, refresh_if_expired
 from app.dependencies.fetcher import Fetcher
 from app.dependencies.user import get_current_user
 from app.helpers import api_doc, asset_proxy_response
 from app.models.error import ErrorType, RequestError
 from app.models.mods import APIMod, int_to_mods
-from app.models.performance import (
-    DifficultyAttributes,
-    DifficultyAttributesUnion,
-)
+from app.models.performance import DifficultyAttributesUnion
 from app.models.score import (
     GameMode,
 )
 
 from .router import router
 
-from fastapi import Path, Query, Security
+from fastapi import Path, Query, Response, Security
 from httpx import HTTPError, HTTPStatusError
+from pydantic_core import from_json
 from sqlmodel import col, select
 
+MISSING_BEATMAP_EXPIRE_SECONDS = 300
+
+
+def _missing_beatmap_key(bid: int | None, md5: str | None = None) -> str:
+    return f"beatmap:missing:{bid}" if bid is not None else f"beatmap:missing:md5:{md5}"
+
+
+async def _mark_beatmap_missing(redis: Redis, key: str, error: HTTPError) -> None:
+    """Remember that upstream has no such beatmap, ignoring transient fetch errors."""
+    if isinstance(error, HTTPStatusError) and error.response.status_code == 404:
+        await redis.set(key, "1", ex=MISSING_BEATMAP_EXPIRE_SECONDS)
+
 
 @router.get(
     "/beatmaps/lookup",
@@ -49,6 +57,7 @@ async def lookup_beatmap(
     db: Database,
     current_user: Annotated[User, Security(get_current_user, scopes=["public"])],
     fetcher: Fetcher,
+    redis: Redis,
     id: Annotated[int | None, Query(alias="id", description="Beatmap ID")] = None,
     md5: Annotated[str | None, Query(alias="checksum", description="Beatmap file MD5")] = None,
     filename: Annotated[str | None, Query(alias="filename", description="Beatmap filename")] = None,
@@ -59,6 +68,7 @@ async def lookup_beatmap(
         db: Database session dependency.
         current_user: The authenticated user.
         fetcher: API fetcher dependency.
+        redis: Redis connection dependency.
         id: Beatmap ID (optional).
         md5: Beatmap file MD5 checksum (optional).
         filename: Beatmap filename (optional).
@@ -71,14 +81,19 @@ async def lookup_beatmap(
     """
     if id is None and md5 is None and filename is None:
         raise RequestError(ErrorType.BEATMAP_LOOKUP_ARGS_MISSING)
+    missing_key = _missing_beatmap_key(id, md5) if id is not None or md5 is not None else None
+    if missing_key is not None and await redis.exists(missing_key):
+        raise RequestError(ErrorType.BEATMAP_NOT_FOUND)
     try:
         beatmap = await Beatmap.get_or_fetch(db, fetcher, bid=id, md5=md5)
-    except HTTPError:
+    except HTTPError as e:
+        if missing_key is not None:
+            await _mark_beatmap_missing(redis, missing_key, e)
         raise RequestError(ErrorType.BEATMAP_NOT_FOUND)
 
     if beatmap is None:
         raise RequestError(ErrorType.BEATMAP_NOT_FOUND)
-    await db.refresh(current_user)
+    await refresh_if_expired(db, current_user)
 
     return await BeatmapModel.transform(beatmap, user=current_user, includes=BeatmapModel.TRANSFORMER_INCLUDES)
 
@@ -96,6 +111,7 @@ async def get_beatmap(
     beatmap_id: Annotated[int, Path(..., description="Beatmap ID")],
     current_user: Annotated[User, Security(get_current_user, scopes=["public"])],
     fetcher: Fetcher,
+    redis: Redis,
 ):
     """Get details for a single beatmap by ID.
 
@@ -104,6 +120,7 @@ async def get_beatmap(
         beatmap_id: The beatmap ID.
         current_user: The authenticated user.
         fetcher: API fetcher dependency.
+        redis: Redis connection dependency.
 
     Returns:
         BeatmapModel: The beatmap details.
@@ -111,15 +128,19 @@ async def get_beatmap(
     Raises:
         RequestError: If beatmap not found.
     """
+    missing_key = _missing_beatmap_key(beatmap_id)
+    if await redis.exists(missing_key):
+        raise RequestError(ErrorType.BEATMAP_NOT_FOUND)
     try:
         beatmap = await Beatmap.get_or_fetch(db, fetcher, beatmap_id)
-        await db.refresh(current_user)
+        await refresh_if_expired(db, current_user)
         return await BeatmapModel.transform(
             beatmap,
             user=current_user,
             includes=BeatmapModel.TRANSFORMER_INCLUDES,
         )
-    except HTTPError:
+    except HTTPError as e:
+        await _mark_beatmap_missing(redis, missing_key, e)
         raise RequestError(ErrorType.BEATMAP_NOT_FOUND)
 
 
@@ -161,24 +182,24 @@ async def batch_get_beatmaps(
     if not beatmap_ids:
         beatmaps = (await db.exec(select(Beatmap).order_by(col(Beatmap.last_updated).desc()).limit(50))).all()
     else:
-        beatmaps = list((await db.exec(select(Beatmap).where(col(Beatmap.id).in_(beatmap_ids)).limit(50))).all())
-        not_found_beatmaps = [bid for bid in beatmap_ids if bid not in [bm.id for bm in beatmaps]]
-        beatmaps.extend(
-            beatmap
-            for beatmap in await asyncio.gather(
+        beatmap_ids = list(dict.fromkeys(beatmap_ids))[:50]
+        beatmaps = (await db.exec(select(Beatmap).where(col(Beatmap.id).in_(beatmap_ids)))).all()
+        found_ids = {bm.id for bm in beatmaps}
+        not_found_beatmaps = [bid for bid in beatmap_ids if bid not in found_ids]
+        if not_found_beatmaps:
+            await asyncio.gather(
                 *[Beatmap.get_or_fetch(db, fetcher, bid=bid) for bid in not_found_beatmaps],
                 return_exceptions=True,
             )
-            if isinstance(beatmap, Beatmap)
-        )
-        for beatmap in beatmaps:
-            await db.refresh(beatmap)
-    await db.refresh(current_user)
+            # Fetching commits and expires everything loaded so far, so reload the
+            # whole batch (with its joined relationships) in one query instead of
+            # refreshing each beatmap.
+            beatmaps = (await db.exec(select(Beatmap).where(col(Beatmap.id).in_(beatmap_ids)))).all()
+    await refresh_if_expired(db, current_user)
     return {
-        "beatmaps": [
-            await BeatmapModel.transform(bm, user=current_user, includes=BeatmapModel.TRANSFORMER_INCLUDES)
-            for bm in beatmaps
-        ]
+        "beatmaps": await BeatmapModel.transform_many(
+            beatmaps, user=current_user, includes=BeatmapModel.TRANSFORMER_INCLUDES
+        )
     }
 
 
@@ -222,7 +243,8 @@ async def get_beatmap_attributes(
         ruleset_id: Alternative way to specify game mode by number.
 
     Returns:
-        DifficultyAttributes: The calculated difficulty attributes.
+        DifficultyAttributes: The calculated difficulty attributes, or the cached
+            JSON body as-is on a cache hit.
 
     Raises:
         RequestError: If beatmap not found or calculation not supported.
@@ -233,21 +255,18 @@ async def get_beatmap_attributes(
     else:
         for i in mods:
             try:
-                mods_.append(json.loads(i))
-            except json.JSONDecodeError:
+                mods_.append(from_json(i))
+            except ValueError:
                 mods_.append(APIMod(acronym=i, settings={}))
-    mods_.sort(key=lambda x: x["acronym"])
     if ruleset_id is not None and ruleset is None:
         ruleset = GameMode.from_int(ruleset_id)
     if ruleset is None:
         beatmap_db = await Beatmap.get_or_fetch(db, fetcher, beatmap_id)
         ruleset = beatmap_db.mode
-    key = (
-        f"beatmap:{beatmap_id}:{ruleset}:"
-        f"{hashlib.md5(str(mods_).encode(), usedforsecurity=False).hexdigest()}:attributes"
-    )
-    if await redis.exists(key):
-        return DifficultyAttributes.model_validate_json(await redis.get(key))  # pyright: ignore[reportArgumentType]
+    key = beatmap_attributes_cache_key(beatmap_id, ruleset, mods_)
+    if cached := await redis.get(key):
+        # Stored by calculate_beatmap_attributes as the serialized response body
+        return Response(content=cached, media_type="application/json")
 
     if await get_calculator().can_calculate_difficulty(ruleset) is False:
         raise RequestError(ErrorType.CANNOT_CALCULATE_DIFFICULTY)
@@ -4,9 +4,7 @@ This module provides endpoints for searching, retrieving, downloading,
 and favouriting beatmapsets.
 """
 
-import re
 from typing import Annotated, Literal
-from urllib.parse import parse_qs
 
 from app.database import (
     Beatmap,
@@ -18,11 +16,11 @@ from app.database import (
 )
 from app.dependencies.beatmap_download import DownloadService
 from app.dependencies.cache import BeatmapsetCacheService, UserCacheService
-from app.dependencies.database import Database, Redis
+from app.dependencies.database import Database, Redis, refresh_if_expired
 from app.dependencies.fetcher import Fetcher
-from app.dependencies.geoip import IPAddress, get_geoip_helper
+from app.dependencies.geoip import GeoIPService, IPAddress
 from app.dependencies.user import ClientUser, get_current_user
-from app.helpers import api_doc, asset_proxy_response
+from app.helpers import api_doc, asset_proxy_response, replace_asset_urls, safe_json_dumps
 from app.models.beatmap import SearchQueryModel
 from app.models.error import ErrorType, RequestError
 from app.models.events.beatmapset import BeatmapsetFavouriteChangedEvent
@@ -38,11 +36,30 @@ from fastapi import (
     Path,
     Query,
     Request,
+    Response,
     Security,
 )
 from fastapi.responses import PlainTextResponse, RedirectResponse
 from httpx import HTTPError
-from sqlmodel import select
+from sqlalchemy.exc import IntegrityError
+from sqlmodel import col, delete, exists, select
+
+FAVOURITE_STATE_EXPIRE_SECONDS = 300
+EMPTY_SEARCH_RESP_JSON = SearchBeatmapsetsResp(total=0, beatmapsets=[]).model_dump_json()
+
+
+def _favourite_state_key(user_id: int, beatmapset_id: int) -> str:
+    return f"fav:{user_id}:{beatmapset_id}"
+
+
+def _parse_cursor_value(value: str) -> int | float | str:
+    """Convert a cursor value to an int or float when it is numeric, else keep the string."""
+    if value.removeprefix("-").isdecimal():
+        return int(value)
+    try:
+        return float(value)
+    except ValueError:
+        return value
 
 
 @router.get(
@@ -78,34 +95,14 @@ async def search_beatmapset(
     Raises:
         RequestError: If the search fails.
     """
-    params = parse_qs(qs=request.url.query, keep_blank_values=True)
     cursor = {}
 
-    # Parse cursor[field] format parameters
-    for k, v in params.items():
-        match = re.match(r"cursor\[(\w+)\]", k)
-        if match:
-            field_name = match.group(1)
-            field_value = v[0] if v else None
-            if field_value is not None:
-                # Convert to appropriate type
-                try:
-                    if field_name in ["approved_date", "id"]:
-                        cursor[field_name] = int(field_value)
-                    else:
-                        # Try to convert to numeric type
-                        try:
-                            # First try to convert to integer
-                            cursor[field_name] = int(field_value)
-                        except ValueError:
-                            try:
-                                # Then try to convert to float
-                                cursor[field_name] = float(field_value)
-                            except ValueError:
-                                # Finally keep as string
-                                cursor[field_name] = field_value
-                except ValueError:
-                    cursor[field_name] = field_value
+    # Parse cursor[field] format parameters from the query string Starlette has already parsed
+    for k, field_value in request.query_params.multi_items():
+        if k.startswith("cursor[") and k.endswith("]"):
+            field_name = k[7:-1]
+            if field_name not in cursor:
+                cursor[field_name] = _parse_cursor_value(field_value)
 
     if (
         "recommended" in query.c
@@ -116,24 +113,25 @@ async def search_beatmapset(
         or "favourites" in query.s
     ):
         # TODO: search locally
-        return SearchBeatmapsetsResp(total=0, beatmapsets=[])
+        return Response(content=EMPTY_SEARCH_RESP_JSON, media_type="application/json")
 
     # Generate hash for query and cursor for caching
-    query_hash = generate_hash(query.model_dump())
+    query_hash = generate_hash(query.model_dump_json())
     cursor_hash = generate_hash(cursor)
 
     # Try to get search results from cache
     cached_result = await cache_service.get_search_from_cache(query_hash, cursor_hash)
     if cached_result:
-        sets = SearchBeatmapsetsResp(**cached_result)
-        return sets
+        return Response(content=cached_result, media_type="application/json")
 
     try:
         sets = await fetcher.search_beatmapset(query, cursor, redis)
 
-        # Cache search results
-        await cache_service.cache_search_result(query_hash, cursor_hash, sets.model_dump())
-        return sets
+        # Cache the final (asset-proxied) body so cache hits can be returned as-is
+        sets = await replace_asset_urls(sets)
+        body = SearchBeatmapsetsResp.model_validate(sets).model_dump_json()
+        await cache_service.cache_search_result(query_hash, cursor_hash, body)
+        return Response(content=body, media_type="application/json")
     except HTTPError as e:
         raise RequestError(ErrorType.INTERNAL, {"message": str(e)}) from e
 
@@ -173,7 +171,7 @@ async def lookup_beatmapset(
     # Try to get from cache first
     cached_resp = await cache_service.get_beatmap_lookup_from_cache(beatmap_id)
     if cached_resp:
-        return cached_resp
+        return Response(content=cached_resp, media_type="application/json")
 
     try:
         beatmap = await Beatmap.get_or_fetch(db, fetcher, bid=beatmap_id)
@@ -182,9 +180,10 @@ async def lookup_beatmapset(
             beatmap.beatmapset, user=current_user, includes=BeatmapsetModel.API_INCLUDES
         )
 
-        # Cache result
-        await cache_service.cache_beatmap_lookup(beatmap_id, resp)
-        return resp
+        # Cache the final (asset-proxied) body so cache hits can be returned as-is
+        body = safe_json_dumps(await replace_asset_urls(resp))
+        await cache_service.cache_beatmap_lookup(beatmap_id, body)
+        return Response(content=body, media_type="application/json")
     except HTTPError as exc:
         raise RequestError(ErrorType.BEATMAP_NOT_FOUND) from exc
 
@@ -224,16 +223,17 @@ async def get_beatmapset(
     # Try to get from cache first
     cached_resp = await cache_service.get_beatmapset_from_cache(beatmapset_id)
     if cached_resp:
-        return cached_resp
+        return Response(content=cached_resp, media_type="application/json")
 
     try:
         beatmapset = await Beatmapset.get_or_fetch(db, fetcher, beatmapset_id)
-        await db.refresh(current_user)
+        await refresh_if_expired(db, current_user)
         resp = await BeatmapsetModel.transform(beatmapset, includes=BeatmapsetModel.API_INCLUDES, user=current_user)
 
-        # Cache result
-        await cache_service.cache_beatmapset(resp)
-        return resp
+        # Cache the final (asset-proxied) body so cache hits can be returned as-is
+        body = safe_json_dumps(await replace_asset_urls(resp))
+        await cache_service.cache_beatmapset(beatmapset_id, body)
+        return Response(content=body, media_type="application/json")
     except HTTPError as exc:
         raise RequestError(ErrorType.BEATMAPSET_NOT_FOUND) from exc
 
@@ -250,6 +250,7 @@ async def get_beatmapset(
 )
 async def download_beatmapset(
     client_ip: IPAddress,
+    geoip: GeoIPService,
     beatmapset_id: Annotated[int, Path(..., description="Beatmapset ID")],
     current_user: ClientUser,
     download_service: DownloadService,
@@ -260,6 +261,7 @@ async def download_beatmapset(
 
     Args:
         client_ip: Client IP address for geolocation.
+        geoip: Shared GeoIP helper used to resolve the client's country.
         beatmapset_id: The beatmapset ID to download.
         current_user: The authenticated user.
         download_service: Download service for load balancing.
@@ -269,8 +271,7 @@ async def download_beatmapset(
     Returns:
         RedirectResponse | str: Redirect to the download URL or the download url text.
     """
-    geoip_helper = get_geoip_helper()
-    geo_info = geoip_helper.lookup(client_ip)
+    geo_info = geoip.lookup(client_ip)
     country_code = geo_info.get("country_iso", "")
 
     # Prefer IP geolocation, fall back to user account country code if unavailable
@@ -305,6 +306,7 @@ async def download_beatmapset(
 )
 async def favourite_beatmapset(
     db: Database,
+    redis: Redis,
     cache_service: UserCacheService,
     beatmapset_id: Annotated[int, Path(..., description="Beatmapset ID")],
     action: Annotated[
@@ -317,29 +319,49 @@ async def favourite_beatmapset(
 
     Args:
         db: Database session dependency.
+        redis: Redis client used to cache the favourite state.
         cache_service: User cache service.
         beatmapset_id: The beatmapset ID.
         action: Action to perform (favourite or unfavourite).
         current_user: The authenticated user.
     """
-    existing_favourite = (
-        await db.exec(
-            select(FavouriteBeatmapset).where(
-                FavouriteBeatmapset.user_id == current_user.id,
-                FavouriteBeatmapset.beatmapset_id == beatmapset_id,
-            )
-        )
-    ).first()
-
-    if (action == "favourite" and existing_favourite) or (action == "unfavourite" and not existing_favourite):
+    user_id = current_user.id
+    state_key = _favourite_state_key(user_id, beatmapset_id)
+    cached_state = await redis.get(state_key)
+    if cached_state == ("1" if action == "favourite" else "0"):
         return
 
-    user_id = current_user.id
     if action == "favourite":
-        favourite = FavouriteBeatmapset(user_id=user_id, beatmapset_id=beatmapset_id)
-        db.add(favourite)
+        if cached_state is None:
+            already_favourited = (
+                await db.exec(
+                    select(exists()).where(
+                        FavouriteBeatmapset.user_id == user_id,
+                        FavouriteBeatmapset.beatmapset_id == beatmapset_id,
+                    )
+                )
+            ).first()
+            if already_favourited:
+                await redis.set(state_key, "1", ex=FAVOURITE_STATE_EXPIRE_SECONDS)
+                return
+        db.add(FavouriteBeatmapset(user_id=user_id, beatmapset_id=beatmapset_id))
     else:
-        await db.delete(existing_favourite)
+        result = await db.execute(
+            delete(FavouriteBeatmapset).where(
+                col(FavouriteBeatmapset.user_id) == user_id,
+                col(FavouriteBeatmapset.beatmapset_id) == beatmapset_id,
+            )
+        )
+        if not result.rowcount:  # pyright: ignore[reportAttributeAccessIssue]
+            await redis.set(state_key, "0", ex=FAVOURITE_STATE_EXPIRE_SECONDS)
+            return
+    try:
+        await db.commit()
+    except IntegrityError:
+        # A concurrent request already favourited this beatmapset
+        await db.rollback()
+        await redis.set(state_key, "1", ex=FAVOURITE_STATE_EXPIRE_SECONDS)
+        return
     await cache_service.invalidate_user_beatmapsets_cache(user_id)
-    await db.commit()
+    await redis.set(state_key, "1" if action == "favourite" else "0", ex=FAVOURITE_STATE_EXPIRE_SECONDS)
     hub.emit(BeatmapsetFavouriteChangedEvent(user_id=user_id, beatmapset_id=beatmapset_id, action=action))
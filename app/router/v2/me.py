@@ -9,17 +9,18 @@ from typing import Annotated
 from app.database import FavouriteBeatmapset, User
 from app.database.achievement import unlock_achievements
 from app.database.user import UserModel
+from app.dependencies.cache import UserCacheService
 from app.dependencies.database import Database, Redis
 from app.dependencies.user import ClientUser, UserAndToken, get_current_user, get_current_user_and_token
 from app.helpers import api_doc
 from app.models.achievement import CLIENTSIDE_MEDALS
 from app.models.error import ErrorType, RequestError
 from app.models.score import GameMode
+from app.router.private.user import update_userpage, validate_bbcode
 
 from .router import router
 
 from fastapi import Path, Security
-from fastapi.responses import RedirectResponse
 from pydantic import BaseModel
 from sqlmodel import select
 
@@ -45,21 +46,28 @@ class BeatmapsetIds(BaseModel):
 )
 async def get_user_beatmapset_favourites(
     session: Database,
+    cache_service: UserCacheService,
     current_user: Annotated[User, Security(get_current_user, scopes=["identify"])],
 ) -> BeatmapsetIds:
     """Get the list of favourite beatmapset IDs for the current user.
 
     Args:
         session: Database session dependency.
+        cache_service: User cache service.
         current_user: The authenticated user.
 
     Returns:
         BeatmapsetIds: Object containing the list of favourite beatmapset IDs.
     """
-    beatmapset_ids = await session.exec(
-        select(FavouriteBeatmapset.beatmapset_id).where(FavouriteBeatmapset.user_id == current_user.id)
-    )
-    return BeatmapsetIds(beatmapset_ids=list(beatmapset_ids.all()))
+    user_id = current_user.id
+    cached_ids = await cache_service.get_user_favourite_beatmapset_ids_from_cache(user_id)
+    if cached_ids is not None:
+        return BeatmapsetIds.model_construct(beatmapset_ids=cached_ids)
+
+    result = await session.exec(select(FavouriteBeatmapset.beatmapset_id).where(FavouriteBeatmapset.user_id == user_id))
+    beatmapset_ids = result.all()
+    await cache_service.cache_user_favourite_beatmapset_ids(user_id, beatmapset_ids)
+    return BeatmapsetIds.model_construct(beatmapset_ids=beatmapset_ids)
 
 
 @router.get(
@@ -112,16 +120,9 @@ async def get_user_info_default(
     return user_resp
 
 
-@router.put("/users/{user_id}/page", include_in_schema=False)
-async def update_userpage():
-    """Redirect to the private user page update endpoint."""
-    return RedirectResponse(url="/api/private/user/page", status_code=307)
-
-
-@router.post("/me/validate-bbcode", include_in_schema=False)
-async def validate_bbcode():
-    """Redirect to the private BBCode validation endpoint."""
-    return RedirectResponse(url="/api/private/user/validate-bbcode", status_code=307)
+# Serve these with the private API handlers directly rather than redirecting, saving clients a round-trip
+router.put("/users/{user_id}/page", include_in_schema=False)(update_userpage)
+router.post("/me/validate-bbcode", include_in_schema=False)(validate_bbcode)
 
 
 @router.put(
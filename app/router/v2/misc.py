@@ -17,7 +17,7 @@ from app.helpers.http import check_image
 
 from .router import router
 
-from fastapi import File
+from fastapi import File, Response
 from pydantic import BaseModel
 
 
@@ -43,6 +43,12 @@ class BackgroundsResp(BaseModel):
     backgrounds: list[Background]
 
 
+# settings.seasonal_backgrounds is fixed for the process lifetime, so the body is serialized once.
+SEASONAL_BACKGROUNDS_JSON = BackgroundsResp(
+    backgrounds=[Background(url=url) for url in settings.seasonal_backgrounds]
+).model_dump_json()
+
+
 @router.get(
     "/seasonal-backgrounds",
     response_model=BackgroundsResp,
@@ -50,13 +56,13 @@ class BackgroundsResp(BaseModel):
     name="Get seasonal backgrounds",
     description="Get the list of current seasonal background images.",
 )
-async def get_seasonal_backgrounds() -> BackgroundsResp:
+async def get_seasonal_backgrounds() -> Response:
     """Retrieve the list of seasonal background images.
 
     Returns:
-        BackgroundsResp: The seasonal backgrounds response containing image URLs.
+        Response: The pre-serialized seasonal backgrounds response containing image URLs.
     """
-    return BackgroundsResp(backgrounds=[Background(url=url) for url in settings.seasonal_backgrounds])
+    return Response(content=SEASONAL_BACKGROUNDS_JSON, media_type="application/json")
 
 
 class ScreenshotResp(BaseModel):
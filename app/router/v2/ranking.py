@@ -4,21 +4,23 @@ This module provides endpoints for retrieving various leaderboards including
 user rankings, team rankings, and country rankings across different game modes.
 """
 
+import asyncio
 from typing import Annotated, Literal
 
 from app.config import settings
 from app.database import Team, TeamMember, User, UserStatistics
 from app.database.statistics import UserStatisticsModel
-from app.dependencies.database import Database, get_redis
+from app.dependencies.cache import RankingCacheService
+from app.dependencies.database import Database, with_db
 from app.dependencies.user import get_current_user
 from app.helpers import api_doc
 from app.models.score import GameMode
-from app.service.ranking_cache_service import get_ranking_cache_service
 
 from .router import router
 
-from fastapi import BackgroundTasks, Path, Query, Security
+from fastapi import BackgroundTasks, Path, Query, Response, Security
 from pydantic import BaseModel, Field
+from pydantic_core import to_json
 from sqlmodel import col, func, select
 
 
@@ -58,6 +60,17 @@ class TeamResponse(BaseModel):
 
 
 SortType = Literal["performance", "score"]
+# Built once; DatabaseModel.transform copies the includes it is given, so these are never mutated
+USER_RANKING_INCLUDES: dict[str, list[str]] = {
+    "performance": [*UserStatistics.RANKING_INCLUDES, "rank_change_since_30_days"],
+    "score": list(UserStatistics.RANKING_INCLUDES),
+}
+USER_RANKING_ORDER_BY = {
+    "performance": col(UserStatistics.pp).desc(),
+    "score": col(UserStatistics.ranked_score).desc(),
+}
+# Expression elements are immutable, so the restriction filter is built once and reused by every ranking query
+NOT_RESTRICTED_STATISTICS = ~User.is_restricted_query(col(UserStatistics.user_id))
 
 
 @router.get(
@@ -69,6 +82,7 @@ SortType = Literal["performance", "score"]
 )
 async def get_team_ranking_pp(
     session: Database,
+    cache_service: RankingCacheService,
     background_tasks: BackgroundTasks,
     ruleset: Annotated[GameMode, Path(..., description="The specified ruleset")],
     current_user: Annotated[User, Security(get_current_user, scopes=["public"])],
@@ -78,6 +92,7 @@ async def get_team_ranking_pp(
 
     Args:
         session: Database session dependency.
+        cache_service: Ranking cache service dependency.
         background_tasks: Background tasks handler.
         ruleset: The game mode to get rankings for.
         current_user: The authenticated user.
@@ -86,7 +101,7 @@ async def get_team_ranking_pp(
     Returns:
         TeamResponse: Team rankings with statistics.
     """
-    return await get_team_ranking(session, background_tasks, "performance", ruleset, current_user, page)
+    return await get_team_ranking(session, cache_service, background_tasks, "performance", ruleset, current_user, page)
 
 
 @router.get(
@@ -98,6 +113,7 @@ async def get_team_ranking_pp(
 )
 async def get_team_ranking(
     session: Database,
+    cache_service: RankingCacheService,
     background_tasks: BackgroundTasks,
     sort: Annotated[
         SortType,
@@ -115,6 +131,7 @@ async def get_team_ranking(
 
     Args:
         session: Database session dependency.
+        cache_service: Ranking cache service dependency.
         background_tasks: Background tasks handler.
         sort: Sort type (performance or score).
         ruleset: The game mode to get rankings for.
@@ -124,105 +141,67 @@ async def get_team_ranking(
     Returns:
         TeamResponse: Team rankings with statistics.
     """
-    # Get Redis connection and cache service
-    redis = get_redis()
-    cache_service = get_ranking_cache_service(redis)
-
-    # Try to get data from cache (team rankings)
-    cached_data = await cache_service.get_cached_team_ranking(ruleset, page)
-    cached_stats = await cache_service.get_cached_team_stats(ruleset)
+    page_size = 50
+    start_idx = (page - 1) * page_size
+    end_idx = start_idx + page_size
 
-    if cached_data and cached_stats:
-        # Return data from cache
-        return TeamResponse(
-            ranking=[TeamStatistics.model_validate(item) for item in cached_data],
-            total=cached_stats.get("total", 0),
+    # The whole sorted ranking is cached under one key; pages are sliced from it
+    cached_data = await cache_service.get_cached_team_ranking(ruleset, sort)
+    if cached_data is not None:
+        # Cached items are already in response shape, so skip model validation and encode the page directly
+        return Response(
+            content=to_json({"ranking": cached_data[start_idx:end_idx], "total": len(cached_data)}),
+            media_type="application/json",
         )
 
-    # Cache miss, query from database
-    response = TeamResponse(ranking=[], total=0)
-    teams = (await session.exec(select(Team))).all()
-    valid_teams = []  # Store valid team statistics
-
-    for team in teams:
-        statistics = (
-            await session.exec(
-                select(UserStatistics).where(
-                    UserStatistics.mode == ruleset,
-                    UserStatistics.pp > 0,
-                    col(UserStatistics.user).has(col(User.team_membership).has(col(TeamMember.team_id) == team.id)),
-                    ~User.is_restricted_query(col(UserStatistics.user_id)),
-                )
+    # Cache miss, aggregate member statistics per team in the database
+    pp_sum = func.sum(UserStatistics.pp)
+    ranked_score_sum = func.sum(UserStatistics.ranked_score)
+    order_by = pp_sum.desc() if sort == "performance" else ranked_score_sum.desc()
+    rows = (
+        await session.execute(
+            select(col(TeamMember.team_id), pp_sum, ranked_score_sum, func.sum(UserStatistics.play_count))
+            .add_columns(func.count())
+            .select_from(UserStatistics)
+            .join(TeamMember, col(TeamMember.user_id) == col(UserStatistics.user_id))
+            .where(
+                col(UserStatistics.mode) == ruleset,
+                col(UserStatistics.pp) > 0,
+                NOT_RESTRICTED_STATISTICS,
             )
-        ).all()
-
-        if not statistics:
-            continue
-
-        pp = 0
-        total_ranked_score = 0
-        total_play_count = 0
-        member_count = 0
-
-        for stat in statistics:
-            total_ranked_score += stat.ranked_score
-            total_play_count += stat.play_count
-            pp += stat.pp
-            member_count += 1
-
-        stats = TeamStatistics(
-            team_id=team.id,
-            ruleset_id=int(ruleset),
-            play_count=total_play_count,
-            ranked_score=total_ranked_score,
+            .group_by(col(TeamMember.team_id))
+            .order_by(order_by, col(TeamMember.team_id))
+        )
+    ).all()
+
+    team_ids = [row[0] for row in rows]
+    teams = {team.id: team for team in (await session.exec(select(Team).where(col(Team.id).in_(team_ids)))).all()}
+
+    # Rows come straight from the aggregate query, so skip per-field validation
+    ruleset_id = int(ruleset)
+    ranking = [
+        TeamStatistics.model_construct(
+            team_id=team_id,
+            ruleset_id=ruleset_id,
+            play_count=int(play_count),
+            ranked_score=int(ranked_score),
             performance=round(pp),
-            team=team,
+            team=teams[team_id],
             member_count=member_count,
         )
-        valid_teams.append(stats)
-
-    # Sort
-    if sort == "performance":
-        valid_teams.sort(key=lambda x: x.performance, reverse=True)
-    else:
-        valid_teams.sort(key=lambda x: x.ranked_score, reverse=True)
-
-    # Calculate total
-    total_count = len(valid_teams)
-
-    # Pagination
-    page_size = 50
-    start_idx = (page - 1) * page_size
-    end_idx = start_idx + page_size
-
-    # Get current page data
-    current_page_data = valid_teams[start_idx:end_idx]
-
-    # Async cache data (don't wait for completion)
-    cache_data = [item.model_dump() for item in current_page_data]
-    stats_data = {"total": total_count}
+        for team_id, pp, ranked_score, play_count, member_count in rows
+    ]
 
     # Create background task to cache data
     background_tasks.add_task(
         cache_service.cache_team_ranking,
         ruleset,
-        cache_data,
-        page,
-        ttl=settings.ranking_cache_expire_minutes * 60,
-    )
-
-    # Cache statistics
-    background_tasks.add_task(
-        cache_service.cache_team_stats,
-        ruleset,
-        stats_data,
+        sort,
+        ranking,
         ttl=settings.ranking_cache_expire_minutes * 60,
     )
 
-    # Return current page results
-    response.ranking = current_page_data
-    response.total = total_count
-    return response
+    return TeamResponse.model_construct(ranking=ranking[start_idx:end_idx], total=len(ranking))
 
 
 class CountryStatistics(BaseModel):
@@ -262,6 +241,7 @@ class CountryResponse(BaseModel):
 )
 async def get_country_ranking_pp(
     session: Database,
+    cache_service: RankingCacheService,
     background_tasks: BackgroundTasks,
     ruleset: Annotated[GameMode, Path(..., description="The specified ruleset")],
     current_user: Annotated[User, Security(get_current_user, scopes=["public"])],
@@ -271,6 +251,7 @@ async def get_country_ranking_pp(
 
     Args:
         session: Database session dependency.
+        cache_service: Ranking cache service dependency.
         background_tasks: Background tasks handler.
         ruleset: The game mode to get rankings for.
         current_user: The authenticated user.
@@ -279,7 +260,9 @@ async def get_country_ranking_pp(
     Returns:
         CountryResponse: Country rankings with statistics.
     """
-    return await get_country_ranking(session, background_tasks, ruleset, "performance", current_user, page)
+    return await get_country_ranking(
+        session, cache_service, background_tasks, ruleset, "performance", current_user, page
+    )
 
 
 @router.get(
@@ -291,6 +274,7 @@ async def get_country_ranking_pp(
 )
 async def get_country_ranking(
     session: Database,
+    cache_service: RankingCacheService,
     background_tasks: BackgroundTasks,
     ruleset: Annotated[GameMode, Path(..., description="The specified ruleset")],
     sort: Annotated[
@@ -308,6 +292,7 @@ async def get_country_ranking(
 
     Args:
         session: Database session dependency.
+        cache_service: Ranking cache service dependency.
         background_tasks: Background tasks handler.
         ruleset: The game mode to get rankings for.
         sort: Sort type (performance or score).
@@ -317,88 +302,59 @@ async def get_country_ranking(
     Returns:
         CountryResponse: Country rankings with statistics.
     """
-    # Get Redis connection and cache service
-    redis = get_redis()
-    cache_service = get_ranking_cache_service(redis)
-
-    # Try to get data from cache
-    cached_data = await cache_service.get_cached_country_ranking(ruleset, page)
-
-    if cached_data:
-        # Return data from cache
-        return CountryResponse(ranking=[CountryStatistics.model_validate(item) for item in cached_data])
+    page_size = 50
+    start_idx = (page - 1) * page_size
+    end_idx = start_idx + page_size
 
-    # Cache miss, query from database
-    response = CountryResponse(ranking=[])
-    countries = (await session.exec(select(User.country_code).distinct())).all()
-
-    for country in countries:
-        if not country:  # Skip empty country codes
-            continue
-
-        statistics = (
-            await session.exec(
-                select(UserStatistics).where(
-                    UserStatistics.mode == ruleset,
-                    UserStatistics.pp > 0,
-                    col(UserStatistics.user).has(country_code=country),
-                    col(UserStatistics.user).has(is_active=True),
-                    ~User.is_restricted_query(col(UserStatistics.user_id)),
-                )
+    # The whole sorted ranking is cached under one key; pages are sliced from it
+    cached_data = await cache_service.get_cached_country_ranking(ruleset, sort)
+    if cached_data is not None:
+        return Response(content=to_json({"ranking": cached_data[start_idx:end_idx]}), media_type="application/json")
+
+    # Cache miss, aggregate user statistics per country in the database
+    pp_sum = func.sum(UserStatistics.pp)
+    ranked_score_sum = func.sum(UserStatistics.ranked_score)
+    order_by = pp_sum.desc() if sort == "performance" else ranked_score_sum.desc()
+    rows = (
+        await session.execute(
+            select(col(User.country_code), func.count(), func.sum(UserStatistics.play_count), ranked_score_sum)
+            .add_columns(pp_sum)
+            .select_from(UserStatistics)
+            .join(User, col(User.id) == col(UserStatistics.user_id))
+            .where(
+                col(UserStatistics.mode) == ruleset,
+                col(UserStatistics.pp) > 0,
+                col(User.is_active).is_(True),
+                col(User.country_code) != "",
+                NOT_RESTRICTED_STATISTICS,
             )
-        ).all()
-
-        if not statistics:  # Skip countries with no data
-            continue
-
-        pp = 0
-        active_users = 0
-        total_play_count = 0
-        total_ranked_score = 0
-
-        for stat in statistics:
-            active_users += 1
-            total_play_count += stat.play_count
-            total_ranked_score += stat.ranked_score
-            pp += stat.pp
+            .group_by(col(User.country_code))
+            .order_by(order_by, col(User.country_code))
+        )
+    ).all()
 
-        country_stats = CountryStatistics(
-            code=country,
+    # Rows come straight from the aggregate query, so skip per-field validation
+    ranking = [
+        CountryStatistics.model_construct(
+            code=code,
             active_users=active_users,
-            play_count=total_play_count,
-            ranked_score=total_ranked_score,
+            play_count=int(play_count),
+            ranked_score=int(ranked_score),
             performance=round(pp),
         )
-        response.ranking.append(country_stats)
-
-    if sort == "performance":
-        response.ranking.sort(key=lambda x: x.performance, reverse=True)
-    else:
-        response.ranking.sort(key=lambda x: x.ranked_score, reverse=True)
-
-    # Pagination
-    page_size = 50
-    start_idx = (page - 1) * page_size
-    end_idx = start_idx + page_size
-
-    # Get current page data
-    current_page_data = response.ranking[start_idx:end_idx]
-
-    # Async cache data (don't wait for completion)
-    cache_data = [item.model_dump() for item in current_page_data]
+        for code, active_users, play_count, ranked_score, pp in rows
+    ]
 
     # Create background task to cache data
     background_tasks.add_task(
         cache_service.cache_country_ranking,
         ruleset,
-        cache_data,
-        page,
+        sort,
+        ranking,
         ttl=settings.ranking_cache_expire_minutes * 60,
     )
 
-    # Return current page results
-    response.ranking = current_page_data
-    return response
+    return CountryResponse.model_construct(ranking=ranking[start_idx:end_idx])
 
 
 @router.get(
@@ -417,6 +373,7 @@ async def get_country_ranking(
 )
 async def get_user_ranking(
     session: Database,
+    cache_service: RankingCacheService,
     background_tasks: BackgroundTasks,
     ruleset: Annotated[GameMode, Path(..., description="The specified ruleset")],
     sort: Annotated[SortType, Path(..., description="Ranking type: performance (pp) / score (ranked score)")],
@@ -428,6 +385,7 @@ async def get_user_ranking(
 
     Args:
         session: Database session dependency.
+        cache_service: Ranking cache service dependency.
         background_tasks: Background tasks handler.
         ruleset: The game mode to get rankings for.
         sort: Sort type (performance or score).
@@ -438,20 +396,15 @@ async def get_user_ranking(
     Returns:
         dict: User rankings with statistics and total count.
     """
-    # Get Redis connection and cache service
-    redis = get_redis()
-    cache_service = get_ranking_cache_service(redis)
-
     # Try to get data from cache
-    cached_data = await cache_service.get_cached_ranking(ruleset, sort, country, page)
-    cached_stats = await cache_service.get_cached_stats(ruleset, sort, country)
+    cached_data, cached_stats = await cache_service.get_cached_ranking_with_stats(ruleset, sort, country, page)
 
     if cached_data and cached_stats:
-        # Return data from cache
-        return {
-            "ranking": cached_data,
-            "total": cached_stats.get("total", 0),
-        }
+        # Return data from cache without going through FastAPI's response encoding
+        return Response(
+            content=to_json({"ranking": cached_data, "total": cached_stats.get("total", 0)}),
+            media_type="application/json",
+        )
 
     # Cache miss, query from database
     wheres = [
@@ -459,30 +412,23 @@ async def get_user_ranking(
         col(UserStatistics.pp) > 0,
         col(UserStatistics.is_ranked),
     ]
-    include = UserStatistics.RANKING_INCLUDES.copy()
-    if sort == "performance":
-        order_by = col(UserStatistics.pp).desc()
-        include.append("rank_change_since_30_days")
-    else:
-        order_by = col(UserStatistics.ranked_score).desc()
+    include = USER_RANKING_INCLUDES[sort]
+    order_by = USER_RANKING_ORDER_BY[sort]
     if country:
-        wheres.append(col(UserStatistics.user).has(country_code=country.upper()))
-        include.append("country_rank")
-
-    # Query total count
-    count_query = select(func.count()).select_from(UserStatistics).where(*wheres)
-    total_count_result = await session.exec(count_query)
-    total_count = total_count_result.one()
-
-    statistics_list = await session.exec(
-        select(UserStatistics)
-        .where(
-            *wheres,
-            ~User.is_restricted_query(col(UserStatistics.user_id)),
-        )
-        .order_by(order_by)
-        .limit(50)
-        .offset(50 * (page - 1))
+        # Uncorrelated IN over the indexed lazer_users.country_code rather than an EXISTS per statistics row
+        wheres.append(col(UserStatistics.user_id).in_(select(User.id).where(col(User.country_code) == country.upper())))
+        include = [*include, "country_rank"]
+
+    wheres.append(NOT_RESTRICTED_STATISTICS)
+
+    async def count_total() -> int:
+        # Runs on its own session so it can overlap with the page query below
+        async with with_db() as count_session:
+            return (await count_session.exec(select(func.count()).select_from(UserStatistics).where(*wheres))).one()
+
+    total_count, statistics_list = await asyncio.gather(
+        count_total(),
+        session.exec(select(UserStatistics).where(*wheres).order_by(order_by).limit(50).offset(50 * (page - 1))),
     )
 
     # Transform to response format
@@ -494,31 +440,18 @@ async def get_user_ranking(
         ranking_data.append(user_stats_resp)
 
     # Async cache data (don't wait for completion)
-    # Use TTL setting from config
-    cache_data = ranking_data
-    stats_data = {"total": total_count}
-
-    # Create background task to cache data
+    # Use TTL setting from config; page and stats are written in one pipelined round-trip
     background_tasks.add_task(
-        cache_service.cache_ranking,
+        cache_service.cache_ranking_with_stats,
         ruleset,
         sort,
-        cache_data,
+        ranking_data,
+        {"total": total_count},
         country,
         page,
         ttl=settings.ranking_cache_expire_minutes * 60,
     )
 
-    # Cache statistics
-    background_tasks.add_task(
-        cache_service.cache_stats,
-        ruleset,
-        sort,
-        stats_data,
-        country,
-        ttl=settings.ranking_cache_expire_minutes * 60,
-    )
-
     return {
         "ranking": ranking_data,
         "total": total_count,
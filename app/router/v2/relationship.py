@@ -20,7 +20,9 @@ from app.plugins import hub
 from .router import router
 
 from fastapi import Path, Query, Request, Security
-from sqlmodel import col, exists, select
+from sqlalchemy.dialects.mysql import insert
+from sqlalchemy.orm import selectinload
+from sqlmodel import col, delete, exists, func, select
 
 
 @router.get(
@@ -61,19 +63,41 @@ async def get_relationship(
         List of relationships or users depending on endpoint and API version.
     """
     relationship_type = RelationshipType.FOLLOW if request.url.path.endswith("/friends") else RelationshipType.BLOCK
+    # Load the targets together with the relations read by User.LIST_INCLUDES,
+    # so the number of queries doesn't grow with the number of relationships
+    target_loader = selectinload(Relationship.target)
     relationships = await db.exec(
-        select(Relationship).where(
+        select(Relationship)
+        .where(
             Relationship.user_id == current_user.id,
             Relationship.type == relationship_type,
             ~User.is_restricted_query(col(Relationship.target_id)),
         )
+        .options(
+            target_loader.selectinload(User.statistics),
+            target_loader.selectinload(User.team_membership),
+        )
     )
     if api_version >= 20241022 or relationship_type == RelationshipType.BLOCK:
+        # Resolve `mutual` for every row with one query instead of one per relationship
+        mutual_target_ids: set[int] = set()
+        if relationship_type == RelationshipType.FOLLOW:
+            mutual_target_ids = set(
+                (
+                    await db.exec(
+                        select(Relationship.user_id).where(
+                            Relationship.target_id == current_user.id,
+                            Relationship.type == RelationshipType.FOLLOW,
+                        )
+                    )
+                ).all()
+            )
         return [
             await RelationshipModel.transform(
                 rel,
                 includes=[f"target.{inc}" for inc in User.LIST_INCLUDES],
                 ruleset=current_user.playmode,
+                mutual_target_ids=mutual_target_ids,
             )
             for rel in relationships.unique()
         ]
@@ -137,39 +161,28 @@ async def add_relationship(
     relationship_type = RelationshipType.FOLLOW if request.url.path.endswith("/friends") else RelationshipType.BLOCK
     if target == current_user.id:
         raise RequestError(ErrorType.CANNOT_ADD_RELATIONSHIP_TO_SELF)
-    relationship = (
-        await db.exec(
-            select(Relationship).where(
-                Relationship.user_id == current_user.id,
-                Relationship.target_id == target,
-            )
+    # Single upsert keyed on the unique (user_id, target_id) index.
+    # Original behavior: if it was block, it would also change to follow
+    # Keeping consistent with ppy/osu-web behavior
+    upsert = insert(Relationship).values(user_id=current_user.id, target_id=target, type=relationship_type)
+    # On a duplicate, `id + LAST_INSERT_ID(0)` keeps the id but zeroes the reported insert id, so a zero
+    # lastrowid means the row already existed (whether or not its type changed), as before the upsert
+    result = await db.execute(
+        upsert.on_duplicate_key_update(
+            type=upsert.inserted.type,
+            id=col(Relationship.id) + func.last_insert_id(0),
         )
-    ).first()
-    if relationship:
-        relationship_action = "update"
-        relationship.type = relationship_type
-        # Original behavior: if it was block, it would also change to follow
-        # Keeping consistent with ppy/osu-web behavior
-    else:
-        relationship_action = "add"
-        relationship = Relationship(
-            user_id=current_user.id,
-            target_id=target,
-            type=relationship_type,
-        )
-        db.add(relationship)
-    origin_type = relationship.type
+    )
+    relationship_action = "update" if result.lastrowid == 0 else "add"  # pyright: ignore[reportAttributeAccessIssue]
+    origin_type = relationship_type
     if origin_type == RelationshipType.BLOCK:
-        target_relationship = (
-            await db.exec(
-                select(Relationship).where(
-                    Relationship.user_id == target,
-                    Relationship.target_id == current_user.id,
-                )
+        await db.execute(
+            delete(Relationship).where(
+                col(Relationship.user_id) == target,
+                col(Relationship.target_id) == current_user.id,
+                col(Relationship.type) == RelationshipType.FOLLOW,
             )
-        ).first()
-        if target_relationship and target_relationship.type == RelationshipType.FOLLOW:
-            await db.delete(target_relationship)
+        )
     current_user_id = current_user.id
     current_gamemode = current_user.playmode
     relationship_type_value = relationship_type.value
@@ -232,27 +245,38 @@ async def delete_relationship(
     """
     if await current_user.is_restricted(db):
         raise RequestError(ErrorType.ACCOUNT_RESTRICTED)
-    if not (
-        await db.exec(select(exists()).where((User.id == target) & ~User.is_restricted_query(col(User.id))))
-    ).first():
-        raise RequestError(ErrorType.TARGET_USER_NOT_FOUND)
-
     relationship_type = RelationshipType.BLOCK if "/blocks/" in request.url.path else RelationshipType.FOLLOW
-    relationship = (
-        await db.exec(
-            select(Relationship).where(
-                Relationship.user_id == current_user.id,
-                Relationship.target_id == target,
-            )
+    # Delete first; the target's existence is implied by the relationship row
+    result = await db.execute(
+        delete(Relationship).where(
+            col(Relationship.user_id) == current_user.id,
+            col(Relationship.target_id) == target,
+            col(Relationship.type) == relationship_type,
+            ~User.is_restricted_query(target),
         )
-    ).first()
-    if not relationship:
-        raise RequestError(ErrorType.RELATIONSHIP_NOT_FOUND)
-    if relationship.type != relationship_type:
+    )
+    if not result.rowcount:  # pyright: ignore[reportAttributeAccessIssue]
+        # Nothing deleted, work out why in a single query
+        target_exists, existing_type = (
+            await db.exec(
+                select(
+                    exists().where((User.id == target) & ~User.is_restricted_query(col(User.id))),
+                    select(Relationship.type)
+                    .where(
+                        Relationship.user_id == current_user.id,
+                        Relationship.target_id == target,
+                    )
+                    .scalar_subquery(),
+                )
+            )
+        ).one()
+        if not target_exists:
+            raise RequestError(ErrorType.TARGET_USER_NOT_FOUND)
+        if existing_type is None:
+            raise RequestError(ErrorType.RELATIONSHIP_NOT_FOUND)
         raise RequestError(ErrorType.RELATIONSHIP_TYPE_MISMATCH)
     current_user_id = current_user.id
     relationship_type_value = relationship_type.value
-    await db.delete(relationship)
     await db.commit()
     hub.emit(
         UserRelationshipChangedEvent(
@@ -4,37 +4,54 @@ This module provides endpoints for managing multiplayer rooms (playlist mode),
 including room creation, participation, leaderboards, and events.
 """
 
+import asyncio
+from collections.abc import Sequence
 from datetime import UTC
 from typing import Annotated, Literal
 
+from app.config import settings
 from app.database.beatmap import (
     Beatmap,
+    BeatmapDict,
     BeatmapModel,
 )
-from app.database.beatmapset import BeatmapsetModel
+from app.database.beatmapset import Beatmapset, BeatmapsetModel
 from app.database.item_attempts_count import ItemAttemptsCount, ItemAttemptsCountModel
 from app.database.multiplayer_event import MultiplayerEvent, MultiplayerEventResp
 from app.database.playlists import Playlist, PlaylistModel
-from app.database.room import APIUploadedRoom, Room, RoomModel
+from app.database.room import APIUploadedRoom, Room, RoomModel, get_recent_participants
 from app.database.room_participated_user import RoomParticipatedUser
 from app.database.score import Score
-from app.database.user import User, UserModel
-from app.dependencies.database import Database, Redis
+from app.database.user import User, UserDict, UserModel
+from app.dependencies.database import Database, Redis, with_db
 from app.dependencies.user import ClientUser, get_current_user
-from app.helpers import api_doc, utcnow
+from app.helpers import api_doc, bg_tasks, utcnow
+from app.log import log
 from app.models.error import ErrorType, RequestError
 from app.models.events.room import RoomCreatedEvent, RoomEndedEvent, RoomUserJoinedEvent, RoomUserLeftEvent
 from app.models.room import MatchType, RoomCategory, RoomStatus
 from app.plugins import hub
-from app.service.room import create_playlist_room_from_api
+from app.service.room import create_playlist_room_from_api, get_room_or_404
 
 from .router import router
 
-from fastapi import Path, Query, Security
+from fastapi import Path, Query, Response, Security
+from pydantic_core import to_json
+from sqlalchemy.orm import joinedload, selectinload
 from sqlalchemy.sql.elements import ColumnElement
-from sqlmodel import col, exists, select
+from sqlmodel import col, exists, select, update
 from sqlmodel.ext.asyncio.session import AsyncSession
 
+logger = log("Room")
+
+ROOM_LIST_INCLUDES = [
+    "current_playlist_item.beatmap.beatmapset",
+    "difficulty_range",
+    "host.country",
+    "playlist_item_stats",
+    "recent_participants",
+]
+
 
 @router.get(
     "/rooms",
@@ -43,13 +60,7 @@ from sqlmodel.ext.asyncio.session import AsyncSession
         200: api_doc(
             "Room list",
             list[RoomModel],
-            [
-                "current_playlist_item.beatmap.beatmapset",
-                "difficulty_range",
-                "host.country",
-                "playlist_item_stats",
-                "recent_participants",
-            ],
+            ROOM_LIST_INCLUDES,
         )
     },
     name="Get room list",
@@ -58,6 +69,7 @@ from sqlmodel.ext.asyncio.session import AsyncSession
 async def get_all_rooms(
     db: Database,
     current_user: Annotated[User, Security(get_current_user, scopes=["public"])],
+    redis: Redis,
     mode: Annotated[
         Literal["open", "ended", "participated", "owned"] | None,
         Query(
@@ -77,9 +89,14 @@ async def get_all_rooms(
 ):
     """Get all rooms matching the specified filters.
 
+    Listings that don't depend on the current user (everything except
+    participated/owned) are cached in Redis for a few seconds, since every
+    lobby client polls them.
+
     Args:
         db: Database session dependency.
         current_user: The authenticated user.
+        redis: Redis connection for the listing cache.
         mode: Room mode filter (open/ended/participated/owned).
         category: Room category filter.
         status: Optional room status filter.
@@ -87,6 +104,12 @@ async def get_all_rooms(
     Returns:
         list[RoomModel]: List of rooms matching the filters.
     """
+    cache_key = None
+    if settings.room_list_cache_expire_seconds > 0 and mode not in ("participated", "owned"):
+        cache_key = f"rooms:list:{category}:{status or 'any'}:{mode or 'all'}"
+        if cached := await redis.get(cache_key):
+            return Response(content=cached, media_type="application/json")
+
     resp_list = []
     where_clauses: list[ColumnElement[bool]] = [col(Room.category) == category, col(Room.type) != MatchType.MATCHMAKING]
     now = utcnow()
@@ -116,34 +139,53 @@ async def get_all_rooms(
     if mode == "ended":
         where_clauses.append((col(Room.ends_at).is_not(None)) & (col(Room.ends_at) < now.replace(tzinfo=UTC)))
 
+    # Room has no joined-loaded collections (the playlist is selectin-loaded by the model and the
+    # participant filter is an EXISTS), so every row is already a distinct room and needs no .unique()
     db_rooms = (
-        (
-            await db.exec(
-                select(Room).where(
-                    *where_clauses,
-                )
+        await db.exec(
+            select(Room)
+            .where(
+                *where_clauses,
             )
+            .options(selectinload(Room.host))
         )
-        .unique()
-        .all()
+    ).all()
+    # Every room shares the requested category, so one query covers all of their participants
+    recent_participants_by_room = await get_recent_participants(
+        db, [room.id for room in db_rooms], active_only=category == RoomCategory.REALTIME
     )
     for room in db_rooms:
         resp = await RoomModel.transform(
             room,
-            includes=[
-                "current_playlist_item.beatmap.beatmapset",
-                "difficulty_range",
-                "host.country",
-                "playlist_item_stats",
-                "recent_participants",
-            ],
+            includes=ROOM_LIST_INCLUDES,
+            recent_participants_by_room=recent_participants_by_room,
         )
         if category == RoomCategory.REALTIME:
             resp["category"] = RoomCategory.NORMAL
 
         resp_list.append(resp)
 
-    return resp_list
+    # The transforms already produced plain dicts; serialize them directly instead of through jsonable_encoder
+    body = to_json(resp_list)
+    if cache_key is not None:
+        await redis.set(cache_key, body, ex=settings.room_list_cache_expire_seconds)
+    return Response(content=body, media_type="application/json")
+
+
+async def _publish_room_event(redis: Redis, channel: str, message: str) -> None:
+    """Publish a room membership change to the chat server.
+
+    Scheduled with ``bg_tasks`` so the request doesn't wait on the Redis round-trip.
+
+    Args:
+        redis: Redis connection.
+        channel: Pub/sub channel name.
+        message: Message payload.
+    """
+    try:
+        await redis.publish(channel, message)
+    except Exception as e:
+        logger.warning(f"Failed to publish {channel} event {message}: {e}")
 
 
 async def _participate_room(room_id: int, user_id: int, db_room: Room, session: AsyncSession, redis: Redis):
@@ -156,27 +198,24 @@ async def _participate_room(room_id: int, user_id: int, db_room: Room, session:
         session: Database session.
         redis: Redis connection for publishing events.
     """
-    participated_user = (
-        await session.exec(
-            select(RoomParticipatedUser).where(
-                RoomParticipatedUser.room_id == room_id,
-                RoomParticipatedUser.user_id == user_id,
-            )
-        )
-    ).first()
-    if participated_user is None:
-        participated_user = RoomParticipatedUser(
-            room_id=room_id,
-            user_id=user_id,
-            joined_at=utcnow(),
+    # Rejoining reactivates an existing participation row; only a first join inserts one
+    now = utcnow()
+    rejoined = await session.execute(
+        update(RoomParticipatedUser)
+        .where(
+            col(RoomParticipatedUser.room_id) == room_id,
+            col(RoomParticipatedUser.user_id) == user_id,
         )
-        session.add(participated_user)
-    else:
-        participated_user.left_at = None
-        participated_user.joined_at = utcnow()
-    db_room.participant_count += 1
+        .values(left_at=None, joined_at=now)
+        .with_dialect_options(mysql_limit=1)
+    )
+    if rejoined.rowcount == 0:  # pyright: ignore[reportAttributeAccessIssue]
+        session.add(RoomParticipatedUser(room_id=room_id, user_id=user_id, joined_at=now))
+    await session.execute(
+        update(Room).where(col(Room.id) == room_id).values(participant_count=col(Room.participant_count) + 1)
+    )
 
-    await redis.publish("chat:room:joined", f"{db_room.channel_id}:{user_id}")
+    bg_tasks.add_task(_publish_room_event, redis, "chat:room:joined", f"{db_room.channel_id}:{user_id}")
 
 
 @router.post(
@@ -216,9 +255,11 @@ async def create_room(
         raise RequestError(ErrorType.ACCOUNT_RESTRICTED)
     user_id = current_user.id
     db_room = await create_playlist_room_from_api(db, room, user_id)
-    await _participate_room(db_room.id, user_id, db_room, db, redis)
+    room_id = db_room.id
+    await _participate_room(room_id, user_id, db_room, db, redis)
     await db.commit()
-    await db.refresh(db_room)
+    # Reload the expired room together with its host in one pass, instead of a refresh plus a lazy host load
+    db_room = await get_room_or_404(db, room_id, options=[selectinload(Room.host)], populate_existing=True)
     created_room = await RoomModel.transform(db_room, includes=Room.SHOW_RESPONSE_INCLUDES)
     hub.emit(RoomCreatedEvent(room_id=db_room.id, host_user_id=user_id, name=db_room.name, category=db_room.category))
     return created_room
@@ -262,9 +303,7 @@ async def get_room(
     Raises:
         RequestError: If the room is not found.
     """
-    db_room = (await db.exec(select(Room).where(Room.id == room_id))).first()
-    if db_room is None:
-        raise RequestError(ErrorType.ROOM_NOT_FOUND)
+    db_room = await get_room_or_404(db, room_id, options=[joinedload(Room.host)])
     resp = await RoomModel.transform(db_room, includes=Room.SHOW_RESPONSE_INCLUDES, user=current_user)
     return resp
 
@@ -296,15 +335,12 @@ async def delete_room(
     if await current_user.is_restricted(db):
         raise RequestError(ErrorType.ACCOUNT_RESTRICTED)
 
-    db_room = (await db.exec(select(Room).where(Room.id == room_id))).first()
-    if db_room is None:
-        raise RequestError(ErrorType.ROOM_NOT_FOUND)
-    else:
-        current_user_id = current_user.id
-        db_room.ends_at = utcnow()
-        await db.commit()
-        hub.emit(RoomEndedEvent(room_id=room_id, actor_user_id=current_user_id))
-        return None
+    db_room = await get_room_or_404(db, room_id)
+    current_user_id = current_user.id
+    db_room.ends_at = utcnow()
+    await db.commit()
+    hub.emit(RoomEndedEvent(room_id=room_id, actor_user_id=current_user_id))
+    return None
 
 
 @router.put(
@@ -338,16 +374,13 @@ async def add_user_to_room(
     if await current_user.is_restricted(db):
         raise RequestError(ErrorType.ACCOUNT_RESTRICTED)
 
-    db_room = (await db.exec(select(Room).where(Room.id == room_id))).first()
-    if db_room is not None:
-        await _participate_room(room_id, user_id, db_room, db, redis)
-        await db.commit()
-        await db.refresh(db_room)
-        resp = await RoomModel.transform(db_room, includes=Room.SHOW_RESPONSE_INCLUDES)
-        hub.emit(RoomUserJoinedEvent(room_id=room_id, user_id=user_id))
-        return resp
-    else:
-        raise RequestError(ErrorType.ROOM_NOT_FOUND)
+    db_room = await get_room_or_404(db, room_id)
+    await _participate_room(room_id, user_id, db_room, db, redis)
+    await db.commit()
+    db_room = await get_room_or_404(db, room_id, options=[selectinload(Room.host)], populate_existing=True)
+    resp = await RoomModel.transform(db_room, includes=Room.SHOW_RESPONSE_INCLUDES)
+    hub.emit(RoomUserJoinedEvent(room_id=room_id, user_id=user_id))
+    return resp
 
 
 @router.delete(
@@ -381,26 +414,25 @@ async def remove_user_from_room(
     if await current_user.is_restricted(db):
         raise RequestError(ErrorType.ACCOUNT_RESTRICTED)
 
-    db_room = (await db.exec(select(Room).where(Room.id == room_id))).first()
-    if db_room is not None:
-        participated_user = (
-            await db.exec(
-                select(RoomParticipatedUser).where(
-                    RoomParticipatedUser.room_id == room_id,
-                    RoomParticipatedUser.user_id == user_id,
-                )
-            )
-        ).first()
-        if participated_user is not None:
-            participated_user.left_at = utcnow()
-        if db_room.participant_count > 0:
-            db_room.participant_count -= 1
-        await redis.publish("chat:room:left", f"{db_room.channel_id}:{user_id}")
-        await db.commit()
-        hub.emit(RoomUserLeftEvent(room_id=room_id, user_id=user_id))
-        return None
-    else:
-        raise RequestError(ErrorType.ROOM_NOT_FOUND)
+    db_room = await get_room_or_404(db, room_id)
+    await db.execute(
+        update(RoomParticipatedUser)
+        .where(
+            col(RoomParticipatedUser.room_id) == room_id,
+            col(RoomParticipatedUser.user_id) == user_id,
+        )
+        .values(left_at=utcnow())
+        .with_dialect_options(mysql_limit=1)
+    )
+    await db.execute(
+        update(Room)
+        .where(col(Room.id) == room_id, col(Room.participant_count) > 0)
+        .values(participant_count=col(Room.participant_count) - 1)
+    )
+    bg_tasks.add_task(_publish_room_event, redis, "chat:room:left", f"{db_room.channel_id}:{user_id}")
+    await db.commit()
+    hub.emit(RoomUserLeftEvent(room_id=room_id, user_id=user_id))
+    return None
 
 
 @router.get(
@@ -424,6 +456,8 @@ async def get_room_leaderboard(
     db: Database,
     room_id: Annotated[int, Path(..., description="Room ID")],
     current_user: Annotated[User, Security(get_current_user, scopes=["public"])],
+    limit: Annotated[int, Query(ge=1, le=100, description="Number of results to return (1-100)")] = 50,
+    offset: Annotated[int, Query(ge=0, description="Number of results to skip")] = 0,
 ):
     """Get the leaderboard for a room.
 
@@ -431,6 +465,8 @@ async def get_room_leaderboard(
         db: Database session dependency.
         room_id: The room ID.
         current_user: The authenticated user.
+        limit: Maximum number of leaderboard entries to return.
+        offset: Number of leaderboard entries to skip.
 
     Returns:
         dict: Leaderboard data with user scores.
@@ -438,29 +474,37 @@ async def get_room_leaderboard(
     Raises:
         RequestError: If the room is not found.
     """
-    db_room = (await db.exec(select(Room).where(Room.id == room_id))).first()
-    if db_room is None:
-        raise RequestError(ErrorType.ROOM_NOT_FOUND)
+    await get_room_or_404(db, room_id)
+    user_agg = None
+    current_user_agg = (
+        await db.exec(
+            select(ItemAttemptsCount)
+            .where(ItemAttemptsCount.room_id == room_id, ItemAttemptsCount.user_id == current_user.id)
+            .options(selectinload(ItemAttemptsCount.user))
+        )
+    ).first()
+    if current_user_agg is not None:
+        user_agg = await ItemAttemptsCountModel.transform(current_user_agg, includes=["user.country", "position"])
+
     aggs = await db.exec(
         select(ItemAttemptsCount)
         .where(ItemAttemptsCount.room_id == room_id)
         .order_by(col(ItemAttemptsCount.total_score).desc())
+        .limit(limit)
+        .offset(offset)
+        .options(selectinload(ItemAttemptsCount.user))
     )
-    aggs_resp = []
-    user_agg = None
-    for i, agg in enumerate(aggs):
-        includes = ["user.country"]
-        if agg.user_id == current_user.id:
-            includes.append("position")
-        resp = await ItemAttemptsCountModel.transform(agg, includes=includes)
-        aggs_resp.append(resp)
-        if agg.user_id == current_user.id:
-            user_agg = resp
+    aggs_resp = [
+        user_agg
+        if user_agg is not None and agg.user_id == current_user.id
+        else await ItemAttemptsCountModel.transform(agg, includes=["user.country"])
+        for agg in aggs
+    ]
 
-    return {
-        "leaderboard": aggs_resp,
-        "user_score": user_agg,
-    }
+    return Response(
+        content=to_json({"leaderboard": aggs_resp, "user_score": user_agg}),
+        media_type="application/json",
+    )
 
 
 @router.get(
@@ -511,16 +555,14 @@ async def get_room_events(
     Raises:
         RequestError: If the room is not found.
     """
+    event_filters: list[ColumnElement[bool]] = [col(MultiplayerEvent.room_id) == room_id]
+    if after is not None:
+        event_filters.append(col(MultiplayerEvent.id) > after)
+    if before is not None:
+        event_filters.append(col(MultiplayerEvent.id) < before)
     events = (
         await db.exec(
-            select(MultiplayerEvent)
-            .where(
-                MultiplayerEvent.room_id == room_id,
-                col(MultiplayerEvent.id) > after if after is not None else True,
-                col(MultiplayerEvent.id) < before if before is not None else True,
-            )
-            .order_by(col(MultiplayerEvent.id).desc())
-            .limit(limit)
+            select(MultiplayerEvent).where(*event_filters).order_by(col(MultiplayerEvent.id).desc()).limit(limit)
         )
     ).all()
 
@@ -529,80 +571,102 @@ async def get_room_events(
     beatmap_ids = set()
 
     event_resps = []
-    first_event_id = 0
-    last_event_id = 0
+    # Events are ordered by ID descending, so the bounds sit at either end of the page
+    last_event_id = events[0].id if events else 0
+    first_event_id = events[-1].id if events else 0
+
+    # Load every referenced playlist item, and the users/beatmaps of their scores, with one IN query each
+    event_playlist_item_ids = {event.playlist_item_id for event in events if event.playlist_item_id is not None}
+    room_playlist_items: dict[int, Playlist] = {}
+    if event_playlist_item_ids:
+        room_playlist_items = {
+            item.id: item
+            for item in (
+                await db.exec(
+                    select(Playlist).where(
+                        col(Playlist.id).in_(event_playlist_item_ids),
+                        Playlist.room_id == room_id,
+                    )
+                )
+            ).all()
+        }
+    if room_playlist_items:
+        scores = await db.exec(
+            select(Score.user_id, Score.beatmap_id).where(
+                col(Score.playlist_item_id).in_(list(room_playlist_items)),
+                Score.room_id == room_id,
+            )
+        )
+        for score_user_id, score_beatmap_id in scores:
+            user_ids.add(score_user_id)
+            beatmap_ids.add(score_beatmap_id)
 
     current_playlist_item_id = 0
     for event in events:
         event_resps.append(MultiplayerEventResp.from_db(event))
         if event.user_id:
             user_ids.add(event.user_id)
-        if event.playlist_item_id is not None and (
-            playitem := (
-                await db.exec(
-                    select(Playlist).where(
-                        Playlist.id == event.playlist_item_id,
-                        Playlist.room_id == room_id,
-                    )
-                )
-            ).first()
-        ):
+        if event.playlist_item_id is not None and (playitem := room_playlist_items.get(event.playlist_item_id)):
             current_playlist_item_id = playitem.id
             playlist_items[event.playlist_item_id] = playitem
             beatmap_ids.add(playitem.beatmap_id)
-            scores = await db.exec(
-                select(Score).where(
-                    Score.playlist_item_id == event.playlist_item_id,
-                    Score.room_id == room_id,
-                )
-            )
-            for score in scores:
-                user_ids.add(score.user_id)
-                beatmap_ids.add(score.beatmap_id)
-        first_event_id = min(first_event_id, event.id)
-        last_event_id = max(last_event_id, event.id)
-
-    room = (await db.exec(select(Room).where(Room.id == room_id))).first()
-    if room is None:
-        raise RequestError(ErrorType.ROOM_NOT_FOUND)
-    room_resp = await RoomModel.transform(room, includes=["current_playlist_item"])
-    if room.category == RoomCategory.REALTIME:
-        current_playlist_item_id = (await Room.current_playlist_item(db, room))["id"]
 
-    users = await db.exec(select(User).where(col(User.id).in_(user_ids)))
-    user_resps = [await UserModel.transform(user, includes=["country"]) for user in users]
+    room = await get_room_or_404(db, room_id)
+    room_resp = await RoomModel.transform(room, includes=["current_playlist_item"])
+    # The room response already carries the current item, so realtime rooms reuse it instead of transforming it again
+    if room.category == RoomCategory.REALTIME and (current_item := room_resp.get("current_playlist_item")):
+        current_playlist_item_id = current_item["id"]
+
+    async def load_users() -> list[UserDict]:
+        if not user_ids:
+            return []
+        # Runs on its own session so it can overlap with the beatmap lookups on the request session
+        async with with_db() as user_session:
+            users = await user_session.exec(select(User).where(col(User.id).in_(user_ids)))
+            return [await UserModel.transform(user, includes=["country"]) for user in users]
+
+    async def load_beatmaps() -> tuple[Sequence[Beatmap], list[BeatmapDict]]:
+        if not beatmap_ids:
+            return [], []
+        # Beatmap.beatmapset is joined-loaded, so the beatmapsets come back with this query
+        beatmaps = (await db.exec(select(Beatmap).where(col(Beatmap.id).in_(beatmap_ids)))).unique().all()
+        beatmap_resps = [
+            await BeatmapModel.transform(
+                beatmap,
+            )
+            for beatmap in beatmaps
+        ]
+        return beatmaps, beatmap_resps
 
-    beatmaps = await db.exec(select(Beatmap).where(col(Beatmap.id).in_(beatmap_ids)))
-    beatmap_resps = [
-        await BeatmapModel.transform(
-            beatmap,
-        )
-        for beatmap in beatmaps
-    ]
+    user_resps, (beatmaps, beatmap_resps) = await asyncio.gather(load_users(), load_beatmaps())
 
-    beatmapsets = []
+    beatmapsets: dict[int, Beatmapset] = {}
     for beatmap in beatmaps:
-        if beatmap.beatmapset_id not in beatmapsets:
-            beatmapsets.append(beatmap.beatmapset)
+        beatmapsets.setdefault(beatmap.beatmapset_id, beatmap.beatmapset)
     beatmapset_resps = [
         await BeatmapsetModel.transform(
             beatmapset,
         )
-        for beatmapset in beatmapsets
+        for beatmapset in beatmapsets.values()
     ]
 
     playlist_items_resps = [
         await PlaylistModel.transform(item, includes=["details", "scores"]) for item in playlist_items.values()
     ]
 
-    return {
-        "beatmaps": beatmap_resps,
-        "beatmapsets": beatmapset_resps,
-        "current_playlist_item_id": current_playlist_item_id,
-        "events": event_resps,
-        "first_event_id": first_event_id,
-        "last_event_id": last_event_id,
-        "playlist_items": playlist_items_resps,
-        "room": room_resp,
-        "user": user_resps,
-    }
+    return Response(
+        content=to_json(
+            {
+                "beatmaps": beatmap_resps,
+                "beatmapsets": beatmapset_resps,
+                "current_playlist_item_id": current_playlist_item_id,
+                "events": event_resps,
+                "first_event_id": first_event_id,
+                "last_event_id": last_event_id,
+                "playlist_items": playlist_items_resps,
+                "room": room_resp,
+                "user": user_resps,
+            }
+        ),
+        media_type="application/json",
+    )
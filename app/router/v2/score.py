@@ -4,10 +4,12 @@ This module provides endpoints for score submission, leaderboards, pinned scores
 replay downloads, and room/playlist score management.
 """
 
+import asyncio
+from bisect import bisect_right
 from datetime import UTC, date
 import sys
 import time
-from typing import Annotated
+from typing import Annotated, Any
 
 from app.calculating import clamp
 from app.config import settings
@@ -37,12 +39,14 @@ from app.database.score import (
     MultiplayScoreDict,
     ScoreModel,
     get_leaderboard,
-    get_score_position_by_id,
+    get_user_best_score_with_position,
     process_score,
     process_user,
+    score_global_position_column,
+    scores_to_resp,
 )
 from app.dependencies.api_version import APIVersion
-from app.dependencies.cache import UserCacheService
+from app.dependencies.cache import LeaderboardCacheService, UserCacheService
 from app.dependencies.client_verification import ClientVerificationService
 from app.dependencies.database import Database, Redis, get_redis, with_db
 from app.dependencies.fetcher import Fetcher, get_fetcher
@@ -72,6 +76,8 @@ from app.models.score import (
 )
 from app.plugins import hub
 from app.service.beatmap_cache_service import get_beatmap_cache_service
+from app.service.leaderboard_cache_service import get_leaderboard_cache_service
+from app.service.ranking_cache_service import get_ranking_cache_service
 from app.service.user_cache_service import refresh_user_cache_background
 from app.v2_ipc import get_ipc_client
 
@@ -89,8 +95,8 @@ from fastapi import (
 )
 from httpx import HTTPError
 from pydantic import BaseModel
+from pydantic_core import to_json
 from pyrate_limiter import Duration, Rate
-from sqlalchemy.orm import joinedload
 from sqlmodel import col, exists, func, select
 from sqlmodel.ext.asyncio.session import AsyncSession
 
@@ -119,20 +125,29 @@ async def _process_user(score_id: int, user_id: int, redis: Redis, fetcher: Fetc
         fetcher: Fetcher service for external data.
     """
     async with with_db() as session:
-        user = await session.get(User, user_id)
-        if not user:
+        # One round-trip for the score, its user (joined-loaded by Score.user), token and beatmap;
+        # the outer joins keep a missing token or beatmap distinguishable for the warnings below
+        row = (
+            await session.exec(
+                select(Score, ScoreToken.id, Beatmap.total_length, Beatmap.beatmap_status)
+                .outerjoin(ScoreToken, col(ScoreToken.score_id) == Score.id)
+                .outerjoin(Beatmap, col(Beatmap.id) == Score.beatmap_id)
+                .where(Score.id == score_id)
+            )
+        ).first()
+        if not row:
             logger.warning(
-                "User {user_id} not found when processing score {score_id}", user_id=user_id, score_id=score_id
+                "Score {score_id} not found when processing user {user_id}", score_id=score_id, user_id=user_id
             )
             return
-        score = await session.get(Score, score_id)
-        if not score:
+        score, score_token, total_length, beatmap_status = row
+        user = score.user
+        if not user or user.id != user_id:
             logger.warning(
-                "Score {score_id} not found when processing user {user_id}", score_id=score_id, user_id=user_id
+                "User {user_id} not found when processing score {score_id}", user_id=user_id, score_id=score_id
             )
             return
         gamemode = score.gamemode
-        score_token = (await session.exec(select(ScoreToken.id).where(ScoreToken.score_id == score_id))).first()
         if not score_token:
             logger.warning(
                 "ScoreToken for score {score_id} not found when processing user {user_id}",
@@ -140,12 +155,7 @@ async def _process_user(score_id: int, user_id: int, redis: Redis, fetcher: Fetc
                 user_id=user_id,
             )
             return
-        beatmap = (
-            await session.exec(
-                select(Beatmap.total_length, Beatmap.beatmap_status).where(Beatmap.id == score.beatmap_id)
-            )
-        ).first()
-        if not beatmap:
+        if total_length is None or beatmap_status is None:
             logger.warning(
                 "Beatmap {beatmap_id} not found when processing user {user_id} for score {score_id}",
                 beatmap_id=score.beatmap_id,
@@ -153,8 +163,12 @@ async def _process_user(score_id: int, user_id: int, redis: Redis, fetcher: Fetc
                 score_id=score_id,
             )
             return
-        await process_user(session, redis, fetcher, user, score, score_token, beatmap[0], BeatmapRankStatus(beatmap[1]))
+        await process_user(
+            session, redis, fetcher, user, score, score_token, total_length, BeatmapRankStatus(beatmap_status)
+        )
         await refresh_user_cache_background(redis, user_id, gamemode)
+        await get_ranking_cache_service(redis).mark_ruleset_dirty(gamemode)
+        await get_leaderboard_cache_service(redis).invalidate_leaderboards(score.beatmap_id, gamemode)
 
         if settings.enable_v2_ipc:
             await get_ipc_client().send_notice("realtime", "score_processed", {"score_id": score_id})
@@ -197,21 +211,12 @@ async def submit_score(
 
     if not info.passed:
         info.rank = Rank.F
-    score_token = (
-        await db.exec(select(ScoreToken).options(joinedload(ScoreToken.beatmap)).where(ScoreToken.id == token))
-    ).first()
+    score_token = await db.get(ScoreToken, token)
     if not score_token or score_token.user_id != user_id:
         raise RequestError(ErrorType.SCORE_TOKEN_NOT_FOUND)
     if score_token.score_id:
-        score = (
-            await db.exec(
-                select(Score).where(
-                    Score.id == score_token.score_id,
-                    Score.user_id == user_id,
-                )
-            )
-        ).first()
-        if not score:
+        score = await db.get(Score, score_token.score_id)
+        if not score or score.user_id != user_id:
             raise RequestError(ErrorType.SCORE_NOT_FOUND)
     else:
         beatmap = score_token.beatmap_id
@@ -219,12 +224,17 @@ async def submit_score(
             cache_service = get_beatmap_cache_service(redis, fetcher)
             await cache_service.smart_preload_for_score(beatmap)
         except Exception as e:
-            logger.debug(f"Beatmap preload failed for {beatmap}: {e}")
+            logger.debug("Beatmap preload failed for {beatmap_id}: {error}", beatmap_id=beatmap, error=e)
 
         try:
             db_beatmap = await Beatmap.get_or_fetch(db, fetcher, bid=beatmap)
         except HTTPError:
-            logger.warning(f"Score submission failed: beatmap {beatmap} not found for user {user_id}, token {token}")
+            logger.warning(
+                "Score submission failed: beatmap {beatmap_id} not found for user {user_id}, token {token}",
+                beatmap_id=beatmap,
+                user_id=user_id,
+                token=token,
+            )
             raise RequestError(ErrorType.BEATMAP_NOT_FOUND)
         score = await process_score(
             user=current_user,
@@ -243,8 +253,13 @@ async def submit_score(
         score,
     )
     logger.info(
-        f"Score {resp['id']} submitted by user {user_id}; beatmap={score.beatmap_id}, "
-        f"mode={score.gamemode}, passed={score.passed}, pp={score.pp}"
+        "Score {score_id} submitted by user {user_id}; beatmap={beatmap_id}, mode={mode}, passed={passed}, pp={pp}",
+        score_id=resp["id"],
+        user_id=user_id,
+        beatmap_id=score.beatmap_id,
+        mode=score.gamemode,
+        passed=score.passed,
+        pp=score.pp,
     )
     await db.commit()
     background_task.add_task(_process_user_achievement, resp["id"])
@@ -269,18 +284,35 @@ async def _preload_beatmap_for_pp_calculation(beatmap_id: int) -> None:
         fetcher = await get_fetcher()
         redis = get_redis()
 
-        # Check if already cached to avoid duplicate downloads
-        cache_key = f"beatmap:raw:{beatmap_id}"
-        if await redis.exists(cache_key):
-            logger.debug(f"Beatmap {beatmap_id} already cached, skipping preload")
+        # Only one worker preloads a beatmap at a time; concurrent starts of the same beatmap skip it
+        lock_key = f"beatmap:preload:lock:{beatmap_id}"
+        if not await redis.set(lock_key, "1", nx=True, ex=60):
             return
-
-        await fetcher.get_or_fetch_beatmap_raw(redis, beatmap_id)
-        logger.debug(f"Successfully preloaded beatmap {beatmap_id} for PP calculation")
+        try:
+            # get_or_fetch_beatmap_raw returns the cached file (refreshing its TTL) without downloading it again
+            await fetcher.get_or_fetch_beatmap_raw(redis, beatmap_id)
+        finally:
+            await redis.delete(lock_key)
+        logger.debug("Successfully preloaded beatmap {beatmap_id} for PP calculation", beatmap_id=beatmap_id)
 
     except Exception as e:
         # Preload failure should not affect normal gameplay
-        logger.warning(f"Failed to preload beatmap {beatmap_id}: {e}")
+        logger.warning("Failed to preload beatmap {beatmap_id}: {error}", beatmap_id=beatmap_id, error=e)
+
+
+async def _get_global_score_position(score: Score) -> int:
+    """Get a score's position on its beatmap's global leaderboard.
+
+    Runs on its own session so it can overlap with serializing scores on the request session.
+
+    Args:
+        score: The score to locate.
+
+    Returns:
+        The 1-based position, or 0 if the score is not on the leaderboard.
+    """
+    async with with_db() as session:
+        return (await session.exec(select(score_global_position_column()).where(Score.id == score.id))).one()
 
 
 LeaderboardScoreType = ScoreModel.generate_typeddict(tuple(ScoreModel.DEFAULT_SCORE_INCLUDES)) | LegacyScoreResp
@@ -312,6 +344,60 @@ class BeatmapScores(BaseModel):
     score_count: int = 0
 
 
+def _score_resp_field(resp: Any, field: str) -> Any:
+    """Read a field of a score response, which is a dict or a `LegacyScoreResp`."""
+    return resp[field] if isinstance(resp, dict) else getattr(resp, field)
+
+
+async def _get_cached_global_beatmap_scores(
+    db: AsyncSession,
+    leaderboard_cache: LeaderboardCacheService,
+    api_version: int,
+    beatmap_id: int,
+    mode: GameMode,
+    current_user: User,
+    limit: int,
+) -> Response:
+    """Serve a global leaderboard from the leaderboard cache.
+
+    The top scores and count are shared by all users; only the current user's
+    own best score and position are looked up for this request. Any cached entry
+    of the current user is replaced by that live score, so a personal best set
+    since the entry was cached does not show up twice.
+    """
+    legacy = api_version < NEW_SCORE_FORMAT_VER
+    cached = await leaderboard_cache.get_cached_leaderboard(beatmap_id, mode, legacy, limit)
+    if cached is None:
+        scores_resp, count = await leaderboard_cache.build_leaderboard(db, beatmap_id, mode, legacy, limit)
+    else:
+        scores_resp, count = cached["scores"], cached["score_count"]
+
+    user_score = None
+    user_best = await get_user_best_score_with_position(db, beatmap_id, current_user.id, mode.to_special_mode([]))
+    if user_best:
+        user_best_score, position = user_best
+        user_score_resp = await user_best_score.to_resp(db, api_version, includes=ScoreModel.DEFAULT_SCORE_INCLUDES)
+        scores_resp = [resp for resp in scores_resp if _score_resp_field(resp, "user_id") != current_user.id]
+        # The global position counts every mod-best above the score, while the list keeps one
+        # score per user, so place it by total score instead (the list is sorted descending)
+        score_field = "score" if legacy else "total_score"
+        index = bisect_right(
+            scores_resp,
+            -user_best_score.total_score,
+            key=lambda resp: -_score_resp_field(resp, score_field),
+        )
+        if index < limit:
+            scores_resp.insert(index, user_score_resp)
+            scores_resp = scores_resp[:limit]
+        else:
+            scores_resp.append(user_score_resp)
+        user_score = {"score": user_score_resp, "position": position}
+    return Response(
+        content=to_json({"scores": scores_resp, "user_score": user_score, "score_count": count}),
+        media_type="application/json",
+    )
+
+
 @router.get(
     "/beatmaps/{beatmap_id}/scores",
     tags=["Scores"],
@@ -339,6 +425,7 @@ async def get_beatmap_scores(
         Query(default_factory=set, alias="mods[]", description="Filter by mods (optional, multiple values)"),
     ],
     current_user: Annotated[User, Security(get_current_user, scopes=["public"])],
+    leaderboard_cache: LeaderboardCacheService,
     legacy_only: Annotated[bool | None, Query(description="Whether to only query Stable scores")] = None,
     type: Annotated[
         LeaderboardType,
@@ -357,6 +444,7 @@ async def get_beatmap_scores(
         mode: The game mode.
         mods: Optional mod filter.
         current_user: The authenticated user.
+        leaderboard_cache: Leaderboard cache service.
         legacy_only: Whether to only query Stable scores.
         type: Leaderboard type filter.
         limit: Maximum number of results.
@@ -364,6 +452,11 @@ async def get_beatmap_scores(
     Returns:
         dict: Leaderboard scores with user score and count.
     """
+    if type == LeaderboardType.GLOBAL and not mods and settings.beatmap_leaderboard_cache_expire_seconds > 0:
+        return await _get_cached_global_beatmap_scores(
+            db, leaderboard_cache, api_version, beatmap_id, mode, current_user, limit
+        )
+
     all_scores, user_score, count = await get_leaderboard(
         db,
         beatmap_id,
@@ -374,30 +467,19 @@ async def get_beatmap_scores(
         mods=sorted(mods),
     )
 
-    user_score_resp = (
-        await user_score.to_resp(db, api_version, includes=ScoreModel.DEFAULT_SCORE_INCLUDES) if user_score else None
-    )
+    if user_score:
+        scores_resp, position = await asyncio.gather(
+            scores_to_resp(db, all_scores, api_version, includes=ScoreModel.DEFAULT_SCORE_INCLUDES),
+            _get_global_score_position(user_score),
+        )
+    else:
+        scores_resp = await scores_to_resp(db, all_scores, api_version, includes=ScoreModel.DEFAULT_SCORE_INCLUDES)
+        position = 0
+    # get_leaderboard always includes the user's own score in the list, so reuse its response
+    user_score_resp = scores_resp[all_scores.index(user_score)] if user_score else None
     return {
-        "scores": [
-            await score.to_resp(db, api_version, includes=ScoreModel.DEFAULT_SCORE_INCLUDES) for score in all_scores
-        ],
-        "user_score": (
-            {
-                "score": user_score_resp,
-                "position": (
-                    await get_score_position_by_id(
-                        db,
-                        user_score.beatmap_id,
-                        user_score.id,
-                        mode=user_score.gamemode,
-                        user=user_score.user,
-                    )
-                    or 0
-                ),
-            }
-            if user_score and user_score_resp
-            else None
-        ),
+        "scores": scores_resp,
+        "user_score": ({"score": user_score_resp, "position": position} if user_score and user_score_resp else None),
         "score_count": count,
     }
 
@@ -447,9 +529,9 @@ async def get_user_beatmap_score(
     Raises:
         RequestError: If the score is not found.
     """
-    user_score = (
+    user_best = (
         await db.exec(
-            select(Score)
+            select(Score, score_global_position_column())
             .where(
                 Score.gamemode == mode if mode is not None else True,
                 Score.beatmap_id == beatmap_id,
@@ -461,24 +543,16 @@ async def get_user_beatmap_score(
         )
     ).first()
 
-    if not user_score:
+    if not user_best:
         raise RequestError(
             ErrorType.SCORE_NOT_FOUND,
             {"user_id": user_id, "beatmap_id": beatmap_id},
         )
     else:
+        user_score, position = user_best
         resp = await user_score.to_resp(db, api_version=api_version, includes=ScoreModel.DEFAULT_SCORE_INCLUDES)
         return {
-            "position": (
-                await get_score_position_by_id(
-                    db,
-                    user_score.beatmap_id,
-                    user_score.id,
-                    mode=user_score.gamemode,
-                    user=user_score.user,
-                )
-                or 0
-            ),
+            "position": position,
             "score": resp,
         }
 
@@ -537,9 +611,7 @@ async def get_user_all_beatmap_scores(
         )
     ).all()
 
-    return [
-        await score.to_resp(db, api_version, includes=ScoreModel.DEFAULT_SCORE_INCLUDES) for score in all_user_scores
-    ]
+    return await scores_to_resp(db, all_user_scores, api_version, includes=ScoreModel.DEFAULT_SCORE_INCLUDES)
 
 
 @router.post(
@@ -21,7 +21,7 @@ from app.database import (
 from app.database.beatmap_playcounts import BeatmapPlaycountsModel
 from app.database.best_scores import BestScore
 from app.database.events import Event
-from app.database.score import Score, get_user_first_scores
+from app.database.score import Score, get_user_first_scores, scores_to_resp
 from app.database.user import UserModel
 from app.dependencies.api_version import APIVersion
 from app.dependencies.cache import UserCacheService
@@ -823,14 +823,7 @@ async def get_user_scores(
         best_scores = await get_user_first_scores(session, db_user.id, gamemode, limit, offset)
         scores = [best_score.score for best_score in best_scores]
 
-    score_responses = [
-        await score.to_resp(
-            session,
-            api_version,
-            includes=includes,
-        )
-        for score in scores
-    ]
+    score_responses = await scores_to_resp(session, scores, api_version, includes=includes)
 
     # 异步缓存结果
     background_task.add_task(
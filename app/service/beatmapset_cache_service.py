@@ -4,14 +4,12 @@ Caches beatmapset data to reduce database query frequency.
 """
 
 import hashlib
-import json
 from typing import TYPE_CHECKING
 
 from app.config import settings
-from app.database import BeatmapsetDict
-from app.helpers import safe_json_dumps
 from app.log import logger
 
+from pydantic_core import to_json
 from redis.asyncio import Redis
 
 if TYPE_CHECKING:
@@ -19,16 +17,16 @@ if TYPE_CHECKING:
 
 
 def generate_hash(data) -> str:
-    """Generate MD5 hash of data.
+    """Generate a short BLAKE2b hash of data for use in cache keys.
 
     Args:
         data: Data to hash (string or JSON-serializable object).
 
     Returns:
-        MD5 hash string.
+        128-bit BLAKE2b hex digest.
     """
-    content = data if isinstance(data, str) else safe_json_dumps(data)
-    return hashlib.md5(content.encode(), usedforsecurity=False).hexdigest()
+    content = data.encode() if isinstance(data, str) else to_json(data)
+    return hashlib.blake2b(content, digest_size=16).hexdigest()
 
 
 class BeatmapsetCacheService:
@@ -44,31 +42,31 @@ class BeatmapsetCacheService:
 
     def _get_beatmapset_cache_key(self, beatmapset_id: int) -> str:
         """Generate beatmapset cache key."""
-        return f"beatmapset:{beatmapset_id}"
+        return f"beatmapset:{beatmapset_id}:json"
 
     def _get_beatmap_lookup_cache_key(self, beatmap_id: int) -> str:
         """Generate beatmap lookup cache key."""
-        return f"beatmap_lookup:{beatmap_id}:beatmapset"
+        return f"beatmap_lookup:{beatmap_id}:beatmapset:json"
 
     def _get_search_cache_key(self, query_hash: str, cursor_hash: str) -> str:
         """Generate search result cache key."""
-        return f"beatmapset_search:{query_hash}:{cursor_hash}"
+        return f"beatmapset_search:{query_hash}:{cursor_hash}:json"
 
-    async def get_beatmapset_from_cache(self, beatmapset_id: int) -> BeatmapsetDict | None:
+    async def get_beatmapset_from_cache(self, beatmapset_id: int) -> str | bytes | None:
         """Get beatmapset info from cache.
 
         Args:
             beatmapset_id: The beatmapset ID.
 
         Returns:
-            Beatmapset data if found, None otherwise.
+            The cached JSON response body if found, None otherwise.
         """
         try:
             cache_key = self._get_beatmapset_cache_key(beatmapset_id)
             cached_data = await self.redis.get(cache_key)
             if cached_data:
                 logger.debug(f"Beatmapset cache hit for {beatmapset_id}")
-                return json.loads(cached_data)
+                return cached_data
             return None
         except (ValueError, TypeError, AttributeError) as e:
             logger.error(f"Error getting beatmapset from cache: {e}")
@@ -76,41 +74,41 @@ class BeatmapsetCacheService:
 
     async def cache_beatmapset(
         self,
-        beatmapset_resp: BeatmapsetDict,
+        beatmapset_id: int,
+        response_body: str,
         expire_seconds: int | None = None,
     ):
         """Cache beatmapset info.
 
         Args:
-            beatmapset_resp: Beatmapset response data.
+            beatmapset_id: The beatmapset ID.
+            response_body: The serialized JSON response body.
             expire_seconds: Cache expiration time in seconds.
         """
         try:
             if expire_seconds is None:
                 expire_seconds = self._default_ttl
-            cache_key = self._get_beatmapset_cache_key(beatmapset_resp["id"])
-            cached_data = safe_json_dumps(beatmapset_resp)
-            await self.redis.setex(cache_key, expire_seconds, cached_data)  # type: ignore
-            logger.debug(f"Cached beatmapset {beatmapset_resp['id']} for {expire_seconds}s")
+            cache_key = self._get_beatmapset_cache_key(beatmapset_id)
+            await self.redis.setex(cache_key, expire_seconds, response_body)
+            logger.debug(f"Cached beatmapset {beatmapset_id} for {expire_seconds}s")
         except (ValueError, TypeError, AttributeError) as e:
             logger.error(f"Error caching beatmapset: {e}")
 
-    async def get_beatmap_lookup_from_cache(self, beatmap_id: int) -> BeatmapsetDict | None:
+    async def get_beatmap_lookup_from_cache(self, beatmap_id: int) -> str | bytes | None:
         """Get beatmapset info from cache by beatmap ID lookup.
 
         Args:
             beatmap_id: The beatmap ID.
 
         Returns:
-            Beatmapset data if found, None otherwise.
+            The cached JSON response body if found, None otherwise.
         """
         try:
             cache_key = self._get_beatmap_lookup_cache_key(beatmap_id)
             cached_data = await self.redis.get(cache_key)
             if cached_data:
                 logger.debug(f"Beatmap lookup cache hit for {beatmap_id}")
-                data = json.loads(cached_data)
-                return data
+                return cached_data
             return None
         except (ValueError, TypeError, AttributeError) as e:
             logger.error(f"Error getting beatmap lookup from cache: {e}")
@@ -119,27 +117,26 @@ class BeatmapsetCacheService:
     async def cache_beatmap_lookup(
         self,
         beatmap_id: int,
-        beatmapset_resp: BeatmapsetDict,
+        response_body: str,
         expire_seconds: int | None = None,
     ):
         """Cache beatmapset info from beatmap ID lookup.
 
         Args:
             beatmap_id: The beatmap ID.
-            beatmapset_resp: Beatmapset response data.
+            response_body: The serialized JSON response body.
             expire_seconds: Cache expiration time in seconds.
         """
         try:
             if expire_seconds is None:
                 expire_seconds = self._default_ttl
             cache_key = self._get_beatmap_lookup_cache_key(beatmap_id)
-            cached_data = safe_json_dumps(beatmapset_resp)
-            await self.redis.setex(cache_key, expire_seconds, cached_data)  # type: ignore
+            await self.redis.setex(cache_key, expire_seconds, response_body)
             logger.debug(f"Cached beatmap lookup {beatmap_id} for {expire_seconds}s")
         except (ValueError, TypeError, AttributeError) as e:
             logger.error(f"Error caching beatmap lookup: {e}")
 
-    async def get_search_from_cache(self, query_hash: str, cursor_hash: str) -> dict | None:
+    async def get_search_from_cache(self, query_hash: str, cursor_hash: str) -> str | bytes | None:
         """Get search results from cache.
 
         Args:
@@ -147,14 +144,14 @@ class BeatmapsetCacheService:
             cursor_hash: Hash of the cursor position.
 
         Returns:
-            Search results if found, None otherwise.
+            The cached JSON response body if found, None otherwise.
         """
         try:
             cache_key = self._get_search_cache_key(query_hash, cursor_hash)
             cached_data = await self.redis.get(cache_key)
             if cached_data:
                 logger.debug(f"Search cache hit for {query_hash[:8]}...{cursor_hash[:8]}")
-                return json.loads(cached_data)
+                return cached_data
             return None
         except (ValueError, TypeError, AttributeError) as e:
             logger.error(f"Error getting search from cache: {e}")
@@ -164,7 +161,7 @@ class BeatmapsetCacheService:
         self,
         query_hash: str,
         cursor_hash: str,
-        search_result: dict,
+        response_body: str,
         expire_seconds: int | None = None,
     ):
         """Cache search results.
@@ -172,15 +169,14 @@ class BeatmapsetCacheService:
         Args:
             query_hash: Hash of the search query.
             cursor_hash: Hash of the cursor position.
-            search_result: Search result data.
+            response_body: The serialized JSON response body.
             expire_seconds: Cache expiration time in seconds.
         """
         try:
             if expire_seconds is None:
                 expire_seconds = min(self._default_ttl, 300)  # Search results have shorter cache time, max 5 minutes
             cache_key = self._get_search_cache_key(query_hash, cursor_hash)
-            cached_data = safe_json_dumps(search_result)
-            await self.redis.setex(cache_key, expire_seconds, cached_data)  # type: ignore
+            await self.redis.setex(cache_key, expire_seconds, response_body)
             logger.debug(f"Cached search result for {expire_seconds}s")
         except (ValueError, TypeError, AttributeError) as e:
             logger.error(f"Error caching search result: {e}")
@@ -0,0 +1,151 @@
+"""Beatmap leaderboard cache service.
+
+Caches the global top scores of beatmap leaderboards in Redis for a short time
+and keeps the most requested leaderboards warm from a scheduled job.
+"""
+
+from typing import Any
+
+from app.config import settings
+from app.const import NEW_SCORE_FORMAT_VER
+from app.database.score import ScoreModel, get_leaderboard, scores_to_resp
+from app.log import logger
+from app.models.score import GameMode
+
+from pydantic_core import from_json, to_json
+from redis.asyncio import Redis
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+
+class LeaderboardCacheService:
+    """Beatmap leaderboard cache service.
+
+    Only the user-independent part of a leaderboard (global top scores and the
+    score count) is cached; the requesting user's own score is resolved per request.
+    """
+
+    POPULARITY_KEY = "leaderboard:popularity"
+
+    def __init__(self, redis: Redis):
+        self.redis = redis
+
+    def _get_cache_key(self, beatmap_id: int, mode: GameMode, legacy: bool, limit: int) -> str:
+        """Generate cache key."""
+        return f"leaderboard:{beatmap_id}:{mode}:{'legacy' if legacy else 'lazer'}:{limit}"
+
+    def _get_index_key(self, beatmap_id: int, mode: GameMode) -> str:
+        """Generate the key of the set tracking a beatmap's cached leaderboards."""
+        return f"leaderboard:index:{beatmap_id}:{mode}"
+
+    def _get_popularity_member(self, beatmap_id: int, mode: GameMode, legacy: bool, limit: int) -> str:
+        """Generate the popularity sorted set member of a leaderboard."""
+        return f"{beatmap_id}:{mode}:{int(legacy)}:{limit}"
+
+    async def get_cached_leaderboard(
+        self, beatmap_id: int, mode: GameMode, legacy: bool, limit: int
+    ) -> dict[str, Any] | None:
+        """Get a cached leaderboard and count the request towards its popularity.
+
+        Args:
+            beatmap_id: The beatmap ID.
+            mode: The game mode.
+            legacy: Whether the scores are in the legacy response format.
+            limit: The number of top scores.
+
+        Returns:
+            The cached `scores` and `score_count`, or None on a cache miss.
+        """
+        try:
+            async with self.redis.pipeline(transaction=False) as pipe:
+                pipe.get(self._get_cache_key(beatmap_id, mode, legacy, limit))
+                pipe.zincrby(self.POPULARITY_KEY, 1, self._get_popularity_member(beatmap_id, mode, legacy, limit))
+                cached, _ = await pipe.execute()
+            return from_json(cached) if cached else None
+        except Exception as e:
+            logger.error(f"Error getting cached leaderboard {beatmap_id}:{mode}: {e}")
+            return None
+
+    async def build_leaderboard(
+        self, session: AsyncSession, beatmap_id: int, mode: GameMode, legacy: bool, limit: int
+    ) -> tuple[list[Any], int]:
+        """Query a global leaderboard from the database and cache it.
+
+        Args:
+            session: Database session.
+            beatmap_id: The beatmap ID.
+            mode: The game mode.
+            legacy: Whether to build the scores in the legacy response format.
+            limit: The number of top scores.
+
+        Returns:
+            A tuple of the score responses and the total score count.
+        """
+        scores, _, count = await get_leaderboard(session, beatmap_id, mode, limit=limit)
+        scores_resp = await scores_to_resp(
+            session,
+            scores,
+            0 if legacy else NEW_SCORE_FORMAT_VER,
+            includes=ScoreModel.DEFAULT_SCORE_INCLUDES,
+        )
+        cache_key = self._get_cache_key(beatmap_id, mode, legacy, limit)
+        index_key = self._get_index_key(beatmap_id, mode)
+        expire_seconds = settings.beatmap_leaderboard_cache_expire_seconds
+        try:
+            async with self.redis.pipeline(transaction=False) as pipe:
+                pipe.set(cache_key, to_json({"scores": scores_resp, "score_count": count}), ex=expire_seconds)
+                pipe.sadd(index_key, cache_key)
+                pipe.expire(index_key, expire_seconds)
+                await pipe.execute()
+        except Exception as e:
+            logger.error(f"Error caching leaderboard {beatmap_id}:{mode}: {e}")
+        return scores_resp, count
+
+    async def invalidate_leaderboards(self, beatmap_id: int, mode: GameMode) -> None:
+        """Delete every cached leaderboard of a beatmap and mode.
+
+        The cached variants (response format and limit) are tracked in an index set,
+        so no key scan is needed.
+
+        Args:
+            beatmap_id: The beatmap ID.
+            mode: The game mode.
+        """
+        index_key = self._get_index_key(beatmap_id, mode)
+        try:
+            cache_keys = await self.redis.smembers(index_key)
+            await self.redis.delete(index_key, *cache_keys)
+        except Exception as e:
+            logger.error(f"Error invalidating leaderboards {beatmap_id}:{mode}: {e}")
+
+    async def warmup_popular_leaderboards(self, session: AsyncSession) -> None:
+        """Rebuild the most requested leaderboards since the last warmup.
+
+        The popularity counters are reset afterwards, so a leaderboard stays warm
+        only while it keeps being requested.
+
+        Args:
+            session: Database session.
+        """
+        members: list[str] = await self.redis.zrevrange(
+            self.POPULARITY_KEY, 0, settings.beatmap_leaderboard_cache_warm_count - 1
+        )  # pyright: ignore[reportAssignmentType]
+        await self.redis.delete(self.POPULARITY_KEY)
+        for member in members:
+            beatmap_id, mode, legacy, limit = member.split(":")
+            try:
+                await self.build_leaderboard(session, int(beatmap_id), GameMode(mode), legacy == "1", int(limit))
+            except Exception as e:
+                logger.error(f"Error warming up leaderboard {member}: {e}")
+        if members:
+            logger.info(f"Warmed up {len(members)} beatmap leaderboards")
+
+
+_leaderboard_cache_service: LeaderboardCacheService | None = None
+
+
+def get_leaderboard_cache_service(redis: Redis) -> LeaderboardCacheService:
+    """Get leaderboard cache service instance."""
+    global _leaderboard_cache_service
+    if _leaderboard_cache_service is None:
+        _leaderboard_cache_service = LeaderboardCacheService(redis)
+    return _leaderboard_cache_service
@@ -4,7 +4,7 @@ Caches user ranking data to reduce database load.
 """
 
 import asyncio
-import json
+from collections.abc import Sequence
 import sys
 from typing import TYPE_CHECKING, Literal
 
@@ -15,8 +15,10 @@ from app.helpers import replace_asset_urls, safe_json_dumps, utcnow
 from app.log import logger
 from app.models.score import GameMode
 
+from pydantic import BaseModel
+from pydantic_core import from_json, to_json
 from redis.asyncio import Redis
-from sqlmodel import col, select
+from sqlmodel import col, func, select
 from sqlmodel.ext.asyncio.session import AsyncSession
 
 if TYPE_CHECKING:
@@ -56,21 +58,21 @@ class RankingCacheService:
         country_part = f":{country.upper()}" if country else ""
         return f"ranking:stats:{ruleset}:{type}{country_part}"
 
-    def _get_country_cache_key(self, ruleset: GameMode, page: int = 1) -> str:
-        """Generate country ranking cache key."""
-        return f"country_ranking:{ruleset}:page:{page}"
+    def _get_country_cache_key(self, ruleset: GameMode, type: Literal["performance", "score"]) -> str:
+        """Generate country ranking cache key (the full sorted ranking)."""
+        return f"country_ranking:{ruleset}:{type}"
 
     def _get_country_stats_cache_key(self, ruleset: GameMode) -> str:
         """Generate country ranking statistics cache key."""
         return f"country_ranking:stats:{ruleset}"
 
-    def _get_team_cache_key(self, ruleset: GameMode, page: int = 1) -> str:
-        """Generate team ranking cache key."""
-        return f"team_ranking:{ruleset}:page:{page}"
+    def _get_team_cache_key(self, ruleset: GameMode, type: Literal["performance", "score"]) -> str:
+        """Generate team ranking cache key (the full sorted ranking)."""
+        return f"team_ranking:{ruleset}:{type}"
 
-    def _get_team_stats_cache_key(self, ruleset: GameMode) -> str:
-        """Generate team ranking statistics cache key."""
-        return f"team_ranking:stats:{ruleset}"
+    def _get_dirty_rulesets_key(self) -> str:
+        """Generate the key of the set of rulesets whose rankings changed since the last dirty refresh."""
+        return "ranking:dirty_rulesets"
 
     async def get_cached_ranking(
         self,
@@ -85,7 +87,7 @@ class RankingCacheService:
             cached_data = await self.redis.get(cache_key)
 
             if cached_data:
-                return json.loads(cached_data)
+                return from_json(cached_data)
             return None
         except Exception as e:
             logger.error(f"Error getting cached ranking: {e}")
@@ -123,7 +125,7 @@ class RankingCacheService:
             cached_data = await self.redis.get(cache_key)
 
             if cached_data:
-                return json.loads(cached_data)
+                return from_json(cached_data)
             return None
         except Exception as e:
             logger.error(f"Error getting cached stats: {e}")
@@ -148,102 +150,122 @@ class RankingCacheService:
         except Exception as e:
             logger.error(f"Error caching stats: {e}")
 
-    async def get_cached_country_ranking(
+    async def get_cached_ranking_with_stats(
         self,
         ruleset: GameMode,
+        type: Literal["performance", "score"],
+        country: str | None = None,
         page: int = 1,
-    ) -> list[dict] | None:
-        """Get cached country ranking data."""
+    ) -> tuple[list[dict] | None, dict | None]:
+        """Get a cached ranking page and its statistics with a single MGET."""
         try:
-            cache_key = self._get_country_cache_key(ruleset, page)
-            cached_data = await self.redis.get(cache_key)
-
-            if cached_data:
-                return json.loads(cached_data)
-            return None
+            cached_data, cached_stats = await self.redis.mget(
+                self._get_cache_key(ruleset, type, country, page),
+                self._get_stats_cache_key(ruleset, type, country),
+            )
+            return (
+                from_json(cached_data) if cached_data else None,
+                from_json(cached_stats) if cached_stats else None,
+            )
         except Exception as e:
-            logger.error(f"Error getting cached country ranking: {e}")
-            return None
+            logger.error(f"Error getting cached ranking with stats: {e}")
+            return None, None
 
-    async def cache_country_ranking(
+    async def cache_ranking_with_stats(
         self,
         ruleset: GameMode,
+        type: Literal["performance", "score"],
         ranking_data: list[dict],
+        stats: dict,
+        country: str | None = None,
         page: int = 1,
         ttl: int | None = None,
     ) -> None:
-        """Cache country ranking data."""
+        """Cache a ranking page and its statistics in one pipelined round-trip."""
         try:
-            cache_key = self._get_country_cache_key(ruleset, page)
             if ttl is None:
                 ttl = settings.ranking_cache_expire_minutes * 60
-            await self.redis.set(cache_key, safe_json_dumps(ranking_data), ex=ttl)
-            logger.debug(f"Cached country ranking data for {cache_key}")
+            async with self.redis.pipeline(transaction=False) as pipe:
+                pipe.set(self._get_cache_key(ruleset, type, country, page), safe_json_dumps(ranking_data), ex=ttl)
+                pipe.set(self._get_stats_cache_key(ruleset, type, country), safe_json_dumps(stats), ex=ttl)
+                await pipe.execute()
+            logger.debug(f"Cached ranking page {page} with stats for {ruleset}:{type}:{country}")
         except Exception as e:
-            logger.error(f"Error caching country ranking: {e}")
+            logger.error(f"Error caching ranking with stats: {e}")
 
-    async def get_cached_team_ranking(
+    async def get_cached_country_ranking(
         self,
         ruleset: GameMode,
-        page: int = 1,
+        type: Literal["performance", "score"],
     ) -> list[dict] | None:
-        """Get cached team ranking data."""
+        """Get the cached full country ranking; callers slice pages from it."""
         try:
-            cache_key = self._get_team_cache_key(ruleset, page)
+            cache_key = self._get_country_cache_key(ruleset, type)
             cached_data = await self.redis.get(cache_key)
 
             if cached_data:
-                return json.loads(cached_data)
+                return from_json(cached_data)
             return None
         except Exception as e:
-            logger.error(f"Error getting cached team ranking: {e}")
+            logger.error(f"Error getting cached country ranking: {e}")
             return None
 
-    async def cache_team_ranking(
+    async def cache_country_ranking(
         self,
         ruleset: GameMode,
-        ranking_data: list[dict],
-        page: int = 1,
+        type: Literal["performance", "score"],
+        ranking: Sequence[BaseModel] | Sequence[dict],
         ttl: int | None = None,
     ) -> None:
-        """Cache team ranking data."""
+        """Cache the full sorted country ranking.
+
+        Serialization happens here so it runs in the background task, not on the request path.
+        """
         try:
-            cache_key = self._get_team_cache_key(ruleset, page)
+            cache_key = self._get_country_cache_key(ruleset, type)
             if ttl is None:
                 ttl = settings.ranking_cache_expire_minutes * 60
-            await self.redis.set(cache_key, safe_json_dumps(ranking_data), ex=ttl)
-            logger.debug(f"Cached team ranking data for {cache_key}")
+            await self.redis.set(cache_key, to_json(ranking), ex=ttl)
+            logger.debug(f"Cached country ranking data for {cache_key}")
         except Exception as e:
-            logger.error(f"Error caching team ranking: {e}")
+            logger.error(f"Error caching country ranking: {e}")
 
-    async def get_cached_team_stats(self, ruleset: GameMode) -> dict | None:
-        """Get cached team ranking statistics."""
+    async def get_cached_team_ranking(
+        self,
+        ruleset: GameMode,
+        type: Literal["performance", "score"],
+    ) -> list[dict] | None:
+        """Get the cached full team ranking; callers slice pages from it."""
         try:
-            cache_key = self._get_team_stats_cache_key(ruleset)
+            cache_key = self._get_team_cache_key(ruleset, type)
             cached_data = await self.redis.get(cache_key)
 
             if cached_data:
-                return json.loads(cached_data)
+                return from_json(cached_data)
             return None
         except Exception as e:
-            logger.error(f"Error getting cached team stats: {e}")
+            logger.error(f"Error getting cached team ranking: {e}")
             return None
 
-    async def cache_team_stats(
+    async def cache_team_ranking(
         self,
         ruleset: GameMode,
-        stats: dict,
+        type: Literal["performance", "score"],
+        ranking: Sequence[BaseModel] | Sequence[dict],
         ttl: int | None = None,
     ) -> None:
-        """Cache team ranking statistics."""
+        """Cache the full sorted team ranking.
+
+        Serialization happens here so it runs in the background task, not on the request path.
+        """
         try:
-            cache_key = self._get_team_stats_cache_key(ruleset)
+            cache_key = self._get_team_cache_key(ruleset, type)
             if ttl is None:
-                ttl = settings.ranking_cache_expire_minutes * 60 * 6
-            await self.redis.set(cache_key, safe_json_dumps(stats), ex=ttl)
-            logger.debug(f"Cached team stats for {cache_key}")
+                ttl = settings.ranking_cache_expire_minutes * 60
+            await self.redis.set(cache_key, to_json(ranking), ex=ttl)
+            logger.debug(f"Cached team ranking data for {cache_key}")
         except Exception as e:
-            logger.error(f"Error caching team stats: {e}")
+            logger.error(f"Error caching team ranking: {e}")
 
     async def get_cached_country_stats(self, ruleset: GameMode) -> dict | None:
         """Get cached country ranking statistics."""
@@ -252,7 +274,7 @@ class RankingCacheService:
             cached_data = await self.redis.get(cache_key)
 
             if cached_data:
-                return json.loads(cached_data)
+                return from_json(cached_data)
             return None
         except Exception as e:
             logger.error(f"Error getting cached country stats: {e}")
@@ -291,7 +313,7 @@ class RankingCacheService:
             cached_data = await self.redis.get(cache_key)
 
             if cached_data:
-                return json.loads(cached_data)
+                return from_json(cached_data)
             return None
         except Exception as e:
             logger.error(f"Error getting cached top scores: {e}")
@@ -318,11 +340,15 @@ class RankingCacheService:
         try:
             logger.info(f"Starting ranking cache refresh for {ruleset}:{type}")
 
+            from app.database import User
+
             # Build query conditions
             wheres = [
                 col(UserStatistics.mode) == ruleset,
                 col(UserStatistics.pp) > 0,
                 col(UserStatistics.is_ranked).is_(True),
+                # Same restriction filter as the rankings endpoint, so cached pages and totals match uncached ones
+                ~User.is_restricted_query(col(UserStatistics.user_id)),
             ]
             include = UserStatistics.RANKING_INCLUDES.copy()
 
@@ -333,12 +359,13 @@ class RankingCacheService:
                 order_by = col(UserStatistics.ranked_score).desc()
 
             if country:
-                wheres.append(col(UserStatistics.user).has(country_code=country.upper()))
+                wheres.append(
+                    col(UserStatistics.user_id).in_(select(User.id).where(col(User.country_code) == country.upper()))
+                )
                 include.append("country_rank")
 
             # Get total user count for statistics
-            total_users_query = select(UserStatistics).where(*wheres)
-            total_users = len((await session.exec(total_users_query)).all())
+            total_users = (await session.exec(select(func.count()).select_from(UserStatistics).where(*wheres))).one()
 
             # Calculate statistics
             stats = {
@@ -401,65 +428,52 @@ class RankingCacheService:
         self,
         session: AsyncSession,
         ruleset: GameMode,
-        max_pages: int | None = None,
     ) -> None:
         """Refresh country ranking cache."""
         if self._refreshing:
             logger.debug(f"Country ranking cache refresh already in progress for {ruleset}")
             return
 
-        if max_pages is None:
-            max_pages = settings.ranking_cache_max_pages
-
         self._refreshing = True
         try:
             logger.info(f"Starting country ranking cache refresh for {ruleset}")
 
-            # Get all countries
             from app.database import User
 
-            countries = (await session.exec(select(User.country_code).distinct())).all()
-
-            # Calculate statistics for each country
-            country_stats_list = []
-            for country in countries:
-                if not country:  # Skip empty country codes
-                    continue
-
-                statistics = (
-                    await session.exec(
-                        select(UserStatistics).where(
-                            UserStatistics.mode == ruleset,
-                            UserStatistics.pp > 0,
-                            col(UserStatistics.user).has(country_code=country),
-                            col(UserStatistics.user).has(is_active=True),
-                        )
+            # Aggregate every country in one grouped query, matching the country ranking endpoint
+            pp_sum = func.sum(UserStatistics.pp)
+            rows = (
+                await session.execute(
+                    select(
+                        col(User.country_code),
+                        func.count(),
+                        func.sum(UserStatistics.play_count),
+                        func.sum(UserStatistics.ranked_score),
                     )
-                ).all()
-
-                if not statistics:  # Skip countries with no data
-                    continue
-
-                pp = 0
-                country_stats = {
-                    "code": country,
-                    "active_users": 0,
-                    "play_count": 0,
-                    "ranked_score": 0,
-                    "performance": 0,
+                    .add_columns(pp_sum)
+                    .select_from(UserStatistics)
+                    .join(User, col(User.id) == col(UserStatistics.user_id))
+                    .where(
+                        col(UserStatistics.mode) == ruleset,
+                        col(UserStatistics.pp) > 0,
+                        col(User.is_active).is_(True),
+                        col(User.country_code) != "",
+                        ~User.is_restricted_query(col(UserStatistics.user_id)),
+                    )
+                    .group_by(col(User.country_code))
+                    .order_by(pp_sum.desc(), col(User.country_code))
+                )
+            ).all()
+            country_stats_list = [
+                {
+                    "code": code,
+                    "active_users": active_users,
+                    "play_count": int(play_count),
+                    "ranked_score": int(ranked_score),
+                    "performance": round(pp),
                 }
-
-                for stat in statistics:
-                    country_stats["active_users"] += 1
-                    country_stats["play_count"] += stat.play_count
-                    country_stats["ranked_score"] += stat.ranked_score
-                    pp += stat.pp
-
-                country_stats["performance"] = round(pp)
-                country_stats_list.append(country_stats)
-
-            # Sort by performance
-            country_stats_list.sort(key=lambda x: x["performance"], reverse=True)
+                for code, active_users, play_count, ranked_score, pp in rows
+            ]
 
             # Calculate statistics
             stats = {
@@ -471,22 +485,14 @@ class RankingCacheService:
             # Cache statistics
             await self.cache_country_stats(ruleset, stats)
 
-            # Paginated data caching (50 countries per page)
-            page_size = 50
-            for page in range(1, max_pages + 1):
-                start_idx = (page - 1) * page_size
-                end_idx = start_idx + page_size
-
-                page_data = country_stats_list[start_idx:end_idx]
-                if not page_data:
-                    break  # No more data
-
-                # Cache this page's data
-                await self.cache_country_ranking(ruleset, page_data, page)
-
-                # Add delay to avoid Redis overload
-                if page < max_pages and page_data:
-                    await asyncio.sleep(0.1)
+            # Cache the full sorted lists; pages are sliced from them on read.
+            # The score sort is reordered in Python, matching the endpoint's (ranked_score desc, code) order
+            await self.cache_country_ranking(ruleset, "performance", country_stats_list)
+            await self.cache_country_ranking(
+                ruleset,
+                "score",
+                sorted(country_stats_list, key=lambda item: (-item["ranked_score"], item["code"])),
+            )
 
             logger.info(f"Completed country ranking cache refresh for {ruleset}")
 
@@ -555,6 +561,39 @@ class RankingCacheService:
         finally:
             self._refreshing = False
 
+    async def mark_ruleset_dirty(self, ruleset: GameMode) -> None:
+        """Mark a ruleset's rankings as changed so the next dirty refresh recomputes them."""
+        try:
+            await self.redis.sadd(self._get_dirty_rulesets_key(), str(ruleset))
+        except Exception as e:
+            logger.error(f"Error marking ranking dirty for {ruleset}: {e}")
+
+    async def refresh_dirty_rankings(self, session: AsyncSession) -> None:
+        """Recompute and cache the global and country rankings of rulesets changed since the last run.
+
+        Only the first pages of the user rankings are rebuilt, since that is where new scores show
+        up first; deeper pages are left to the full refresh. The country aggregate scans the whole
+        ruleset, so it is debounced with a longer, separate interval.
+        """
+        if self._refreshing:
+            # Leave the dirty set untouched so the next run picks it up
+            return
+
+        rulesets = await self.redis.spop(self._get_dirty_rulesets_key(), len(GameMode))
+        for ruleset in rulesets or []:
+            mode = GameMode(ruleset)
+            for ranking_type in ("performance", "score"):
+                await self.refresh_ranking_cache(
+                    session, mode, ranking_type, max_pages=settings.ranking_cache_dirty_refresh_max_pages
+                )
+            if await self.redis.set(
+                f"ranking:country:dirty_refreshed:{mode}",
+                "1",
+                nx=True,
+                ex=settings.ranking_cache_dirty_country_refresh_interval_seconds,
+            ):
+                await self.refresh_country_ranking_cache(session, mode)
+
     async def refresh_all_rankings(self, session: AsyncSession) -> None:
         """Refresh all ranking caches."""
         game_modes = [GameMode.OSU, GameMode.TAIKO, GameMode.FRUITS, GameMode.MANIA, GameMode.OSURX]
@@ -563,8 +602,6 @@ class RankingCacheService:
         # Get list of countries to cache (top 20 countries by active user count)
         from app.database import User
 
-        from sqlmodel import func
-
         countries_query = (
             await session.exec(
                 select(User.country_code, func.count().label("user_count"))
@@ -743,3 +780,15 @@ async def schedule_ranking_refresh_task(session: AsyncSession, redis: Redis):
         await cache_service.refresh_all_rankings(session)
     except Exception as e:
         logger.error(f"Scheduled ranking refresh task failed: {e}")
+
+
+async def schedule_dirty_ranking_refresh_task(session: AsyncSession, redis: Redis):
+    """Scheduled refresh of rankings marked dirty by score submissions."""
+    if not settings.enable_ranking_cache:
+        return
+
+    cache_service = get_ranking_cache_service(redis)
+    try:
+        await cache_service.refresh_dirty_rankings(session)
+    except Exception as e:
+        logger.error(f"Scheduled dirty ranking refresh task failed: {e}")
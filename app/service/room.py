@@ -3,6 +3,7 @@
 Provides functionality for creating and managing playlist rooms.
 """
 
+from collections.abc import Sequence
 from datetime import timedelta
 
 from app.database.beatmap import Beatmap
@@ -11,13 +12,45 @@ from app.database.playlists import Playlist
 from app.database.room import APIUploadedRoom, Room
 from app.dependencies.fetcher import get_fetcher
 from app.helpers import utcnow
+from app.models.error import ErrorType, RequestError
 from app.models.room import MatchType, QueueMode, RoomCategory, RoomStatus
 
 from sqlalchemy import exists
+from sqlalchemy.orm.interfaces import ORMOption
 from sqlmodel import col, select
 from sqlmodel.ext.asyncio.session import AsyncSession
 
 
+async def get_room_or_404(
+    session: AsyncSession,
+    room_id: int,
+    *,
+    options: Sequence[ORMOption] = (),
+    populate_existing: bool = False,
+) -> Room:
+    """Get a room by ID or raise ROOM_NOT_FOUND.
+
+    Uses the session's identity map, so a room already loaded in this session
+    is returned without another query.
+
+    Args:
+        session: Database session.
+        room_id: Room ID.
+        options: Loader options (e.g. ``joinedload(Room.host)``) applied when the room is queried.
+        populate_existing: Always query and overwrite the loaded room, e.g. after a commit expired it.
+
+    Returns:
+        The Room object.
+
+    Raises:
+        RequestError: If the room does not exist.
+    """
+    room = await session.get(Room, room_id, options=options, populate_existing=populate_existing)
+    if room is None:
+        raise RequestError(ErrorType.ROOM_NOT_FOUND)
+    return room
+
+
 async def create_playlist_room_from_api(session: AsyncSession, room: APIUploadedRoom, host_id: int) -> Room:
     """Create a playlist room from API-uploaded room data.
 
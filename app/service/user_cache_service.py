@@ -3,6 +3,7 @@
 Caches user information with hot caching and real-time refresh capabilities.
 """
 
+from collections.abc import Sequence
 import json
 from typing import TYPE_CHECKING, Any
 
@@ -39,17 +40,30 @@ class UserCacheService:
     def _get_v1_user_cache_key(self, user_id: int, ruleset: GameMode | None = None) -> str:
         """Generate V1 user cache key."""
         if ruleset:
-            return f"v1_user:{user_id}:ruleset:{ruleset}"
-        return f"v1_user:{user_id}"
+            return f"v1_user:{user_id}:ruleset:{ruleset}:json"
+        return f"v1_user:{user_id}:json"
 
-    async def get_v1_user_from_cache(self, user_id: int, ruleset: GameMode | None = None) -> dict | None:
-        """Get V1 user info from cache."""
+    def _get_v1_username_cache_key(self, username: str) -> str:
+        """Generate V1 username to user ID pointer key."""
+        return f"v1_user:username:{username.lower()}"
+
+    async def get_v1_user_id_by_username(self, username: str) -> int | None:
+        """Resolve a username to a user ID via the V1 username pointer cache."""
+        try:
+            user_id = await self.redis.get(self._get_v1_username_cache_key(username))
+            return int(user_id) if user_id else None
+        except Exception as e:
+            logger.error(f"Error getting V1 username pointer from cache: {e}")
+            return None
+
+    async def get_v1_user_from_cache(self, user_id: int, ruleset: GameMode | None = None) -> str | bytes | None:
+        """Get the cached V1 user response body."""
         try:
             cache_key = self._get_v1_user_cache_key(user_id, ruleset)
             cached_data = await self.redis.get(cache_key)
             if cached_data:
                 logger.debug(f"V1 User cache hit for user {user_id}")
-                return json.loads(cached_data)
+                return cached_data
             return None
         except Exception as e:
             logger.error(f"Error getting V1 user from cache: {e}")
@@ -57,18 +71,19 @@ class UserCacheService:
 
     async def cache_v1_user(
         self,
-        user_data: dict,
+        response_body: str,
         user_id: int,
+        username: str,
         ruleset: GameMode | None = None,
         expire_seconds: int | None = None,
     ):
-        """Cache V1 user info."""
+        """Cache the V1 user response body and its username pointer."""
         try:
             if expire_seconds is None:
                 expire_seconds = settings.user_cache_expire_seconds
             cache_key = self._get_v1_user_cache_key(user_id, ruleset)
-            cached_data = safe_json_dumps(user_data)
-            await self.redis.setex(cache_key, expire_seconds, cached_data)
+            await self.redis.setex(cache_key, expire_seconds, response_body)
+            await self.redis.setex(self._get_v1_username_cache_key(username), expire_seconds, user_id)
             logger.debug(f"Cached V1 user {user_id} for {expire_seconds}s")
         except Exception as e:
             logger.error(f"Error caching V1 user: {e}")
@@ -114,6 +129,10 @@ class UserCacheService:
         """Generate user beatmapsets cache key."""
         return f"user:{user_id}:beatmapsets:{beatmapset_type}:limit:{limit}:offset:{offset}"
 
+    def _get_user_favourite_beatmapset_ids_cache_key(self, user_id: int) -> str:
+        """Generate user favourite beatmapset IDs cache key."""
+        return f"user:{user_id}:beatmapsets:favourite_ids"
+
     async def get_user_from_cache(self, user_id: int, ruleset: GameMode | None = None) -> UserDict | None:
         """Get user info from cache."""
         try:
@@ -243,6 +262,34 @@ class UserCacheService:
         except Exception as e:
             logger.error(f"Error caching user beatmapsets: {e}")
 
+    async def get_user_favourite_beatmapset_ids_from_cache(self, user_id: int) -> list[int] | None:
+        """Get user favourite beatmapset IDs from cache."""
+        try:
+            cached_data = await self.redis.get(self._get_user_favourite_beatmapset_ids_cache_key(user_id))
+            if cached_data:
+                logger.debug(f"User favourite beatmapset IDs cache hit for user {user_id}")
+                return json.loads(cached_data)
+            return None
+        except Exception as e:
+            logger.error(f"Error getting user favourite beatmapset IDs from cache: {e}")
+            return None
+
+    async def cache_user_favourite_beatmapset_ids(
+        self,
+        user_id: int,
+        beatmapset_ids: Sequence[int],
+        expire_seconds: int | None = None,
+    ):
+        """Cache user favourite beatmapset IDs."""
+        try:
+            if expire_seconds is None:
+                expire_seconds = settings.user_beatmapsets_cache_expire_seconds
+            cache_key = self._get_user_favourite_beatmapset_ids_cache_key(user_id)
+            await self.redis.setex(cache_key, expire_seconds, json.dumps(beatmapset_ids, separators=(",", ":")))
+            logger.debug(f"Cached user {user_id} favourite beatmapset IDs for {expire_seconds}s")
+        except Exception as e:
+            logger.error(f"Error caching user favourite beatmapset IDs: {e}")
+
     async def invalidate_user_cache(self, user_id: int):
         """Invalidate user cache."""
         try:
@@ -374,7 +421,9 @@ class UserCacheService:
 
             return {
                 "cached_users": len([k for k in decoded_user_keys if ":scores:" not in k and ":beatmapsets:" not in k]),
-                "cached_v1_users": len([k for k in decoded_v1_user_keys if ":scores:" not in k]),
+                "cached_v1_users": len(
+                    [k for k in decoded_v1_user_keys if ":scores:" not in k and ":username:" not in k]
+                ),
                 "cached_user_scores": len([k for k in decoded_user_keys if ":scores:" in k]),
                 "cached_user_beatmapsets": len([k for k in decoded_user_keys if ":beatmapsets:" in k]),
                 "total_cached_entries": len(all_keys),
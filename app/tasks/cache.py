@@ -16,7 +16,8 @@ from app.dependencies.fetcher import get_fetcher
 from app.dependencies.scheduler import get_scheduler
 from app.helpers import utcnow
 from app.log import logger
-from app.service.ranking_cache_service import schedule_ranking_refresh_task
+from app.service.leaderboard_cache_service import get_leaderboard_cache_service
+from app.service.ranking_cache_service import schedule_dirty_ranking_refresh_task, schedule_ranking_refresh_task
 from app.service.user_cache_service import get_user_cache_service
 
 from apscheduler.jobstores.base import JobLookupError
@@ -26,6 +27,8 @@ from sqlmodel import col, func, select
 CACHE_JOB_IDS: Final[dict[str, str]] = {
     "beatmap_warmup": "cache:beatmap:warmup",
     "ranking_refresh": "cache:ranking:refresh",
+    "ranking_dirty_refresh": "cache:ranking:dirty_refresh",
+    "leaderboard_warmup": "cache:leaderboard:warmup",
     "user_preload": "cache:user:preload",
     "user_cleanup": "cache:user:cleanup",
 }
@@ -50,6 +53,19 @@ async def warmup_cache() -> None:
         logger.error(f"Beatmap cache warmup failed: {e}")
 
 
+async def warmup_leaderboard_cache() -> None:
+    """Warm up popular beatmap leaderboards.
+
+    Rebuilds the most requested global leaderboards before their cache entries expire.
+    """
+    try:
+        redis = get_redis()
+        async with with_db() as session:
+            await get_leaderboard_cache_service(redis).warmup_popular_leaderboards(session)
+    except Exception as e:
+        logger.error(f"Leaderboard cache warmup failed: {e}")
+
+
 async def refresh_ranking_cache() -> None:
     """Refresh ranking cache.
 
@@ -71,6 +87,19 @@ async def refresh_ranking_cache() -> None:
         logger.error(f"Ranking cache refresh failed: {e}")
 
 
+async def refresh_dirty_ranking_cache() -> None:
+    """Refresh rankings of rulesets that received scores since the last run.
+
+    Keeps hot ranking caches warm between full refreshes, so readers rarely
+    hit an expired entry after a burst of submissions.
+    """
+    try:
+        async with with_db() as session:
+            await schedule_dirty_ranking_refresh_task(session, get_redis())
+    except Exception as e:
+        logger.error(f"Dirty ranking cache refresh failed: {e}")
+
+
 async def schedule_user_cache_preload_task() -> None:
     """Scheduled user cache preload task.
 
@@ -218,7 +247,9 @@ def register_cache_jobs() -> None:
 
     Registers the following scheduled jobs:
     - Beatmap warmup (every 30 minutes)
+    - Popular leaderboard warmup (configurable interval)
     - Ranking refresh (configurable interval)
+    - Dirty ranking refresh (configurable interval, rulesets with new scores only)
     - User preload (every 15 minutes)
     - User cleanup (every hour)
     """
@@ -234,6 +265,20 @@ def register_cache_jobs() -> None:
         misfire_grace_time=300,
     )
 
+    if settings.beatmap_leaderboard_cache_expire_seconds > 0:
+        scheduler.add_job(
+            warmup_leaderboard_cache,
+            trigger=IntervalTrigger(
+                seconds=settings.beatmap_leaderboard_cache_warm_interval_seconds,
+                timezone=UTC,
+            ),
+            id=CACHE_JOB_IDS["leaderboard_warmup"],
+            replace_existing=True,
+            coalesce=True,
+            max_instances=1,
+            misfire_grace_time=60,
+        )
+
     scheduler.add_job(
         refresh_ranking_cache,
         trigger=IntervalTrigger(
@@ -247,6 +292,19 @@ def register_cache_jobs() -> None:
         misfire_grace_time=300,
     )
 
+    scheduler.add_job(
+        refresh_dirty_ranking_cache,
+        trigger=IntervalTrigger(
+            seconds=settings.ranking_cache_dirty_refresh_interval_seconds,
+            timezone=UTC,
+        ),
+        id=CACHE_JOB_IDS["ranking_dirty_refresh"],
+        replace_existing=True,
+        coalesce=True,
+        max_instances=1,
+        misfire_grace_time=60,
+    )
+
     scheduler.add_job(
         preload_user_cache,
         trigger=IntervalTrigger(minutes=15, timezone=UTC),
@@ -0,0 +1,42 @@
+"""favourite_beatmapset: add unique (user_id, beatmapset_id) index
+
+Revision ID: 2b1c41831581
+Revises: 27eb30853d3d
+Create Date: 2026-10-17 10:12:37.418205
+
+"""
+
+from collections.abc import Sequence
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "2b1c41831581"
+down_revision: str | Sequence[str] | None = "27eb30853d3d"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Remove duplicate favourites left by concurrent requests, keeping the earliest row
+    op.execute(
+        """
+        DELETE f1 FROM favourite_beatmapset f1
+        JOIN favourite_beatmapset f2
+          ON f1.user_id = f2.user_id
+         AND f1.beatmapset_id = f2.beatmapset_id
+         AND f1.id > f2.id
+        """
+    )
+    op.create_index(
+        "ix_favourite_beatmapset_user_beatmapset",
+        "favourite_beatmapset",
+        ["user_id", "beatmapset_id"],
+        unique=True,
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index("ix_favourite_beatmapset_user_beatmapset", table_name="favourite_beatmapset")
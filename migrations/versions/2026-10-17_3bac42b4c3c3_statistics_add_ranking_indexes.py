@@ -0,0 +1,39 @@
+"""statistics: add ranking indexes
+
+Revision ID: 3bac42b4c3c3
+Revises: 2b1c41831581
+Create Date: 2026-10-17 11:04:52.730169
+
+"""
+
+from collections.abc import Sequence
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "3bac42b4c3c3"
+down_revision: str | Sequence[str] | None = "2b1c41831581"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_index(
+        "ix_lazer_user_statistics_mode_ranked_pp",
+        "lazer_user_statistics",
+        ["mode", "is_ranked", "pp"],
+        unique=False,
+    )
+    op.create_index(
+        "ix_lazer_user_statistics_mode_ranked_score",
+        "lazer_user_statistics",
+        ["mode", "is_ranked", "ranked_score"],
+        unique=False,
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index("ix_lazer_user_statistics_mode_ranked_score", table_name="lazer_user_statistics")
+    op.drop_index("ix_lazer_user_statistics_mode_ranked_pp", table_name="lazer_user_statistics")
@@ -0,0 +1,42 @@
+"""relationship: add unique (user_id, target_id) index
+
+Revision ID: 5d0f6a2e9c71
+Revises: 3bac42b4c3c3
+Create Date: 2026-10-17 12:21:09.184532
+
+"""
+
+from collections.abc import Sequence
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "5d0f6a2e9c71"
+down_revision: str | Sequence[str] | None = "3bac42b4c3c3"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Remove duplicate relationships left by concurrent requests, keeping the latest row
+    op.execute(
+        """
+        DELETE r1 FROM relationship r1
+        JOIN relationship r2
+          ON r1.user_id = r2.user_id
+         AND r1.target_id = r2.target_id
+         AND r1.id < r2.id
+        """
+    )
+    op.create_index(
+        "ix_relationship_user_target",
+        "relationship",
+        ["user_id", "target_id"],
+        unique=True,
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index("ix_relationship_user_target", table_name="relationship")
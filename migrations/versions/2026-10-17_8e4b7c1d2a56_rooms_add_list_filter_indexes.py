@@ -0,0 +1,39 @@
+"""rooms: add list filter indexes
+
+Revision ID: 8e4b7c1d2a56
+Revises: 5d0f6a2e9c71
+Create Date: 2026-10-17 13:02:41.517203
+
+"""
+
+from collections.abc import Sequence
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "8e4b7c1d2a56"
+down_revision: str | Sequence[str] | None = "5d0f6a2e9c71"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_index(
+        "ix_rooms_category_status_ends_at",
+        "rooms",
+        ["category", "status", "ends_at"],
+        unique=False,
+    )
+    op.create_index(
+        "ix_room_participated_users_user_room",
+        "room_participated_users",
+        ["user_id", "room_id"],
+        unique=False,
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index("ix_room_participated_users_user_room", table_name="room_participated_users")
+    op.drop_index("ix_rooms_category_status_ends_at", table_name="rooms")
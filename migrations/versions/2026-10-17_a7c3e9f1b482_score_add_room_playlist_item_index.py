@@ -0,0 +1,32 @@
+"""score: add (room_id, playlist_item_id) index
+
+Revision ID: a7c3e9f1b482
+Revises: 8e4b7c1d2a56
+Create Date: 2026-10-17 14:37:12.904615
+
+"""
+
+from collections.abc import Sequence
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "a7c3e9f1b482"
+down_revision: str | Sequence[str] | None = "8e4b7c1d2a56"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_index(
+        "idx_score_room_playlist_item",
+        "scores",
+        ["room_id", "playlist_item_id"],
+        unique=False,
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index("idx_score_room_playlist_item", table_name="scores")
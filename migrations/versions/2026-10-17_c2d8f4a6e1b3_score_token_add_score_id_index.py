@@ -0,0 +1,27 @@
+"""score_token: add score_id index
+
+Revision ID: c2d8f4a6e1b3
+Revises: a7c3e9f1b482
+Create Date: 2026-10-17 15:48:26.331047
+
+"""
+
+from collections.abc import Sequence
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "c2d8f4a6e1b3"
+down_revision: str | Sequence[str] | None = "a7c3e9f1b482"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_index("idx_score_token_score_id", "score_tokens", ["score_id"], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index("idx_score_token_score_id", table_name="score_tokens")